@@ -1,33 +1,193 @@
 """The NEC Projector integration."""
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
 
-from .api import NecProjectorApi
-from .const import DOMAIN, LOGGER, PLATFORMS, SERVICE_SEND_COMMAND, SERVICE_SEND_ASCII_COMMAND
+from . import codec
+from .api import (
+    PRIORITY_USER,
+    NecProjectorApi,
+    ProjectorCommandError,
+    ProjectorConnectionError,
+    custom_query,
+)
+from .const import (
+    CONF_MEMBERS,
+    CONF_TRACE_SIZE,
+    DATA_DEVICES,
+    DATA_SCHEDULER,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
+    DOMAIN,
+    GROUP_PLATFORMS,
+    LOGGER,
+    PLATFORMS,
+    SERVICE_QUERY,
+    SERVICE_SEND_ASCII_COMMAND,
+    SERVICE_SEND_COMMAND,
+    STARTUP_REFRESH_WINDOW,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
 from .coordinator import NecProjectorCoordinator
+from .group import NecProjectorGroup
+from .scheduler import NecProjectorPollScheduler
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up NEC Projector from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
+    if CONF_MEMBERS in entry.data:
+        return await _async_setup_group_entry(hass, entry)
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = NecProjectorPollScheduler()
+        domain_data[DATA_DEVICES] = {}
+    scheduler = domain_data[DATA_SCHEDULER]
     host = entry.data["host"]
     port = entry.data["port"]
 
-    api = NecProjectorApi(host=host, port=port)
-    coordinator = NecProjectorCoordinator(hass, api)
+    api = NecProjectorApi(
+        host=host, port=port, trace_size=entry.options.get(CONF_TRACE_SIZE, 0)
+    )
+    coordinator = NecProjectorCoordinator(hass, api, scheduler)
+    store = _async_get_store(hass, entry)
 
-    await coordinator.async_config_entry_first_refresh()
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    if snapshot := await store.async_load():
+        # Come up from the last-known state and let the first live refresh
+        # happen in this projector's slot of the startup window.
+        coordinator.async_restore(snapshot)
+        scheduler.register(coordinator)
+        coordinator.update_interval = timedelta(
+            seconds=scheduler.startup_delay(coordinator, STARTUP_REFRESH_WINDOW)
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await api.async_close()
+            raise
+        if not coordinator.last_update_success:
+            await api.async_close()
+            raise ConfigEntryNotReady
+        scheduler.register(coordinator)
+        store.async_delay_save(coordinator.snapshot, STORAGE_SAVE_DELAY)
 
     hass.data[entry.entry_id] = coordinator
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            lambda: store.async_delay_save(coordinator.snapshot, STORAGE_SAVE_DELAY)
+        )
+    )
+
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, entry.unique_id)},
+        name=entry.title,
+    )
+    domain_data[DATA_DEVICES][device.id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    async def send_command_service(call: ServiceCall) -> dict[str, str]:
+    _async_register_services(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+    _async_reload_groups(hass, entry)
+
+    return True
+
+
+async def _async_setup_group_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a group of projectors driven together."""
+    group = NecProjectorGroup(hass, entry.data[CONF_MEMBERS])
+    if pending := group.pending_members:
+        raise ConfigEntryNotReady(
+            f"Waiting for {len(pending)} projectors of the group to be set up"
+        )
+    hass.data[entry.entry_id] = group
+    await hass.config_entries.async_forward_entry_setups(entry, GROUP_PLATFORMS)
+    return True
+
+
+@callback
+def _async_reload_groups(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the groups of a projector so they follow its new coordinator."""
+    for group_entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.entry_id not in group_entry.data.get(CONF_MEMBERS, ()):
+            continue
+        if group_entry.state in (ConfigEntryState.LOADED, ConfigEntryState.SETUP_RETRY):
+            hass.async_create_task(
+                hass.config_entries.async_reload(group_entry.entry_id)
+            )
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _async_get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the last-known state of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+async def _async_send_to_devices(
+    hass: HomeAssistant,
+    device_ids: list[str],
+    send: Callable[[NecProjectorCoordinator], Awaitable[str | dict]],
+    fields: tuple[str, ...] | None,
+) -> dict[str, dict[str, str | dict | float]]:
+    """Send a command to several projectors concurrently.
+
+    Returns the response or error and the latency of every targeted device,
+    then refreshes the fields the command affects on all targeted
+    coordinators together, or runs a full refresh if they are unknown.
+    Read-only queries affect no field and refresh nothing.
+    """
+    devices = hass.data[DOMAIN][DATA_DEVICES]
+    targets = {
+        device_id: devices[device_id] for device_id in device_ids if device_id in devices
+    }
+    semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENT_COMMANDS)
+
+    async def send_to_device(coordinator: NecProjectorCoordinator) -> dict:
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                response = await send(coordinator)
+            except (ProjectorConnectionError, ProjectorCommandError) as err:
+                result = {"error": str(err)}
+            else:
+                result = {"response": response}
+            result["latency"] = round(time.monotonic() - start, 3)
+            return result
+
+    results = await asyncio.gather(
+        *(send_to_device(coordinator) for coordinator in targets.values())
+    )
+    if fields == ():
+        return dict(zip(targets, results))
+    if fields is None:
+        refreshes = [coordinator.async_request_refresh() for coordinator in targets.values()]
+    else:
+        refreshes = [
+            coordinator.async_refresh_fields(*fields) for coordinator in targets.values()
+        ]
+    await asyncio.gather(*refreshes)
+    return dict(zip(targets, results))
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration services once for all config entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_SEND_COMMAND):
+        return
+
+    async def send_command_service(call: ServiceCall) -> dict:
         """Handle the send_command service call."""
         command_hex = call.data.get("command", "")
         devices = call.data.get("device_id", [])
@@ -38,40 +198,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             LOGGER.error("Invalid command format. Must be a hex string")
             return {"response": "Invalid command format"}
 
-        device_reg = dr.async_get(hass)
-        for device_id in devices:
-            device = device_reg.async_get(device_id)
-            if device:
-                for config_entry_id in device.config_entries:
-                    if config_entry_id in hass.data:
-                        target_coordinator = hass.data[config_entry_id]
-                        response = (
-                            await target_coordinator.api.async_send_custom_command(
-                                command_bytes
-                            )
-                        )
-                        await target_coordinator.async_request_refresh()
-                        return {"response": response}
-        return {"response": "No valid device found"}
-
-    async def send_ascii_command_service(call: ServiceCall) -> dict[str, str]:
+        results = await _async_send_to_devices(
+            hass,
+            devices,
+            lambda coordinator: coordinator.api.async_send_custom_command(command_bytes),
+            codec.command_fields(command_bytes) if command_bytes else None,
+        )
+        if not results:
+            return {"response": "No valid device found"}
+        return {"devices": results}
+
+    async def send_ascii_command_service(call: ServiceCall) -> dict:
         """Handle the send_ascii_command service call."""
         command_str = call.data.get("command", "")
         devices = call.data.get("device_id", [])
 
-        device_reg = dr.async_get(hass)
-        for device_id in devices:
-            device = device_reg.async_get(device_id)
-            if device:
-                for config_entry_id in device.config_entries:
-                    if config_entry_id in hass.data:
-                        target_coordinator = hass.data[config_entry_id]
-                        response = await target_coordinator.api.async_send_custom_ascii_command(
-                            command_str
-                        )
-                        await target_coordinator.async_request_refresh()
-                        return {"response": response}
-        return {"response": "No valid device found"}
+        results = await _async_send_to_devices(
+            hass,
+            devices,
+            lambda coordinator: coordinator.api.async_send_custom_ascii_command(
+                command_str
+            ),
+            codec.command_fields(codec.ascii_command(command_str))
+            if command_str.strip()
+            else None,
+        )
+        if not results:
+            return {"response": "No valid device found"}
+        return {"devices": results}
+
+    async def query_service(call: ServiceCall) -> dict:
+        """Handle the query service call."""
+        # Results are keyed by the command, so each one is only sent once.
+        ascii_commands = list(
+            dict.fromkeys(
+                command for command in call.data.get("commands", []) if command.strip()
+            )
+        )
+        hex_commands = list(dict.fromkeys(call.data.get("hex_commands", [])))
+        devices = call.data.get("device_id", [])
+
+        try:
+            commands = [codec.ascii_command(command) for command in ascii_commands]
+            commands += [bytes.fromhex(command) for command in hex_commands]
+        except ValueError:
+            LOGGER.error("Invalid command format. Must be a hex string")
+            return {"response": "Invalid command format"}
+        if not commands:
+            return {"response": "No query given"}
+        labels = [*ascii_commands, *hex_commands]
+        for label, command in zip(labels, commands):
+            if codec.command_fields(command) != ():
+                return {"response": f"Not a read-only query: {label}"}
+        queries = [custom_query(command) for command in commands]
+
+        async def query_device(coordinator: NecProjectorCoordinator) -> dict:
+            # A query the projector ignores must not count against its
+            # connection or its pipelining.
+            results = await coordinator.api.async_query_batch(
+                queries, PRIORITY_USER, record_failures=False
+            )
+            return {
+                label: {"error": str(result.error)}
+                if result.error is not None
+                else result.value
+                for label, result in zip(labels, results)
+            }
+
+        results = await _async_send_to_devices(hass, devices, query_device, ())
+        if not results:
+            return {"response": "No valid device found"}
+        return {"devices": results}
 
     hass.services.async_register(
         DOMAIN,
@@ -87,17 +284,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         supports_response=SupportsResponse.ONLY,
     )
 
-    return True
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY,
+        query_service,
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if CONF_MEMBERS in entry.data:
+        unload_ok = await hass.config_entries.async_unload_platforms(
+            entry, GROUP_PLATFORMS
+        )
+        if unload_ok:
+            hass.data.pop(entry.entry_id)
+        return unload_ok
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.pop(entry.entry_id)
+        coordinator = hass.data.pop(entry.entry_id)
+        domain_data = hass.data[DOMAIN]
+        domain_data[DATA_SCHEDULER].unregister(coordinator)
+        domain_data[DATA_DEVICES] = {
+            device_id: device_coordinator
+            for device_id, device_coordinator in domain_data[DATA_DEVICES].items()
+            if device_coordinator is not coordinator
+        }
+        await coordinator.api.async_close()
 
-    if not hass.data:
-        hass.services.async_remove(DOMAIN, SERVICE_SEND_COMMAND)
-        hass.services.async_remove(DOMAIN, SERVICE_SEND_ASCII_COMMAND)
+        if not domain_data[DATA_DEVICES]:
+            hass.services.async_remove(DOMAIN, SERVICE_SEND_COMMAND)
+            hass.services.async_remove(DOMAIN, SERVICE_SEND_ASCII_COMMAND)
+            hass.services.async_remove(DOMAIN, SERVICE_QUERY)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted state of a deleted config entry."""
+    await _async_get_store(hass, entry).async_remove()
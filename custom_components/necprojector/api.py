@@ -1,58 +1,685 @@
 """API for NEC Projector Control."""
 
 import asyncio
-import re
+import contextlib
+import heapq
+import itertools
+import socket
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from functools import partial
+from typing import Any, NamedTuple
 
-from .const import DEFAULT_PORT, DEFAULT_TIMEOUT, LOGGER
+from . import codec
+from .breaker import STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, RoundTripEstimator
+from .codec import (
+    ASCII_TERMINATOR,
+    BINARY_HEADER_LENGTH,
+    CMD_FILTER_USAGE_QUERY,
+    CMD_INPUT_QUERY,
+    CMD_INPUT_STATUS_QUERY,
+    CMD_LAMP_USAGE_QUERY,
+    CMD_MUTE_STATUS_QUERY,
+    CMD_POWER_OFF,
+    CMD_POWER_ON,
+    CMD_SHUTTER_CLOSE,
+    CMD_SHUTTER_OPEN,
+    CMD_SHUTTER_QUERY,
+    CMD_STATUS_QUERY,
+    ProjectorCommandError,
+    ProjectorRejectedError,
+)
+from .const import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_PORT,
+    DEFAULT_TIMEOUT,
+    LOGGER,
+    MIN_REPLY_TIMEOUT,
+    PIPELINING_FAILURE_THRESHOLD,
+    ProjectorStatus,
+)
+from .stats import NecProjectorApiStats
+from .trace import ProtocolTrace
 
-# NEC Projector Commands (Hex Bytes)
-CMD_POWER_ON = b"\x02\x00\x00\x00\x00\x02"
-CMD_POWER_OFF = b"\x02\x01\x00\x00\x00\x03"
-CMD_STATUS_QUERY = b"\x00\x85\x00\x00\x01\x01\x87"
-# NEC Projector Commands (ASCII)
-CMD_SHUTTER = "shutter {shutter_arg}\r"
-CMD_LENS = "lens {lens_subcmd} {lens_arg}\r"
-CMD_INPUT = "input {input_arg}\r"
+# Reply framing
+MAX_FRAME_LENGTH = 4096
+
+# Command priorities, lower values are sent first
+PRIORITY_USER = 0
+PRIORITY_POLL = 10
+
+
+# A query command and the parser of its reply
+Query = tuple[bytes, Callable[[bytes], dict]]
 
 
 class ProjectorConnectionError(Exception):
     """Exception to indicate a connection error."""
 
 
-class ProjectorCommandError(Exception):
-    """Exception to indicate a command error."""
+class QueryResult(NamedTuple):
+    """Parsed reply to one query of a batch."""
+
+    value: dict[str, Any] | None
+    error: ProjectorCommandError | None
+    latency: float
+
+
+def _parse_status(response: bytes) -> dict[str, bool | ProjectorStatus | int]:
+    """Parse a status reply."""
+    power_on, status, model_code = codec.decode_status(response)
+    return {"power_on": power_on, "status": status, "model_code": model_code}
+
+
+def _parse_shutter_status(response: bytes) -> dict[str, str]:
+    """Parse a shutter reply."""
+    return {"shutter_status": codec.decode_shutter(response)}
+
+
+def _parse_input_value(response: bytes) -> dict[str, str]:
+    """Parse the current input of an input reply."""
+    return {"input_value": codec.decode_input_value(response)}
+
+
+def _parse_input_options(response: bytes) -> dict[str, str | tuple[str, ...]]:
+    """Parse an input reply with its input options."""
+    input_value, input_options = codec.decode_input(response)
+    return {"input_value": input_value, "input_options": input_options}
+
+
+def _parse_lens_position(axis: str, response: bytes) -> dict[str, int]:
+    """Parse the current position of a lens reply."""
+    return {f"{axis}_value": codec.decode_lens_position(response)}
+
+
+def _parse_lens_value(axis: str, response: bytes) -> dict[str, int]:
+    """Parse a lens reply with its range."""
+    lens_value, max_value, min_value = codec.decode_lens(response)
+    return {
+        f"{axis}_value": lens_value,
+        f"{axis}_max": max_value,
+        f"{axis}_min": min_value,
+    }
+
+
+def _parse_input_status(response: bytes) -> dict[str, int]:
+    """Parse the selected input terminal of an input status reply."""
+    input_status = codec.decode_input_status(response)
+    return {
+        "input_terminal": input_status.terminal,
+        "input_terminal_type": input_status.terminal_type,
+    }
+
+
+def _parse_mute_status(response: bytes) -> dict[str, bool]:
+    """Parse a mute status reply."""
+    mute_status = codec.decode_mute_status(response)
+    return {
+        "picture_mute": mute_status.picture,
+        "sound_mute": mute_status.sound,
+        "onscreen_mute": mute_status.onscreen,
+    }
+
+
+def _parse_lamp_usage(response: bytes) -> dict[str, float]:
+    """Parse a lamp information reply into hours of use."""
+    return {"lamp_usage": round(codec.decode_lamp_usage(response) / 3600, 1)}
+
+
+def _parse_filter_usage(response: bytes) -> dict[str, float]:
+    """Parse a filter usage reply into hours of use."""
+    return {"filter_usage": round(codec.decode_filter_usage(response) / 3600, 1)}
+
+
+STATUS_QUERY: Query = (CMD_STATUS_QUERY, _parse_status)
+INPUT_STATUS_QUERY: Query = (CMD_INPUT_STATUS_QUERY, _parse_input_status)
+MUTE_STATUS_QUERY: Query = (CMD_MUTE_STATUS_QUERY, _parse_mute_status)
+LAMP_USAGE_QUERY: Query = (CMD_LAMP_USAGE_QUERY, _parse_lamp_usage)
+FILTER_USAGE_QUERY: Query = (CMD_FILTER_USAGE_QUERY, _parse_filter_usage)
+SHUTTER_QUERY: Query = (CMD_SHUTTER_QUERY, _parse_shutter_status)
+INPUT_QUERY: Query = (CMD_INPUT_QUERY, _parse_input_value)
+INPUT_OPTIONS_QUERY: Query = (CMD_INPUT_QUERY, _parse_input_options)
+
+
+def _parse_ascii_fields(response: bytes) -> dict[str, str]:
+    """Parse the key=value fields of any ASCII reply, or keep it as text."""
+    codec.check_reply(response)
+    if fields := codec.parse_fields(response):
+        return fields
+    return {"response": response.decode("ascii", "replace").strip()}
+
+
+def _parse_binary_reply(response: bytes) -> dict[str, str]:
+    """Keep a binary reply without a known layout as hex."""
+    codec.check_reply(response)
+    return {"response": response.hex()}
+
+
+# Binary queries whose replies have a known layout
+_BINARY_PARSERS = dict(
+    (
+        STATUS_QUERY,
+        INPUT_STATUS_QUERY,
+        MUTE_STATUS_QUERY,
+        LAMP_USAGE_QUERY,
+        FILTER_USAGE_QUERY,
+    )
+)
+
+
+def custom_query(command: bytes) -> Query:
+    """Return a free-form query with the best parser for its reply."""
+    if codec.is_ascii_command(command):
+        return command, _parse_ascii_fields
+    return command, _BINARY_PARSERS.get(command, _parse_binary_reply)
+
+
+def lens_query(axis: str, with_range: bool = False) -> Query:
+    """Return the query of a lens position, optionally with its range."""
+    parser = _parse_lens_value if with_range else _parse_lens_position
+    return codec.lens_query(axis), partial(parser, axis)
+
+
+class _FrameReader:
+    """Read complete protocol replies from a session.
+
+    Binary replies are framed by the data length in the fifth header byte,
+    followed by a checksum byte. ASCII replies end with a carriage return.
+    Received bytes are kept in one buffer per session so any trailing bytes
+    are preserved for the next frame.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        """Initialize the frame reader."""
+        self._reader = reader
+        self._buffer = bytearray()
+
+    async def _fill(self) -> None:
+        """Read more bytes from the session into the buffer."""
+        chunk = await self._reader.read(MAX_FRAME_LENGTH)
+        if not chunk:
+            raise ConnectionResetError("Session closed by projector")
+        self._buffer += chunk
+        if len(self._buffer) > MAX_FRAME_LENGTH:
+            raise ProjectorCommandError("Reply from projector exceeds frame limit")
+
+    def _take(self, length: int) -> bytes:
+        """Remove and return the first length bytes of the buffer."""
+        frame = bytes(self._buffer[:length])
+        del self._buffer[:length]
+        return frame
+
+    def _skip_line_feeds(self) -> None:
+        """Drop the line feed of a CR LF terminated previous reply."""
+        while self._buffer[:1] == b"\n":
+            del self._buffer[0]
+
+    async def read_binary(self) -> bytes:
+        """Read one binary reply frame."""
+        self._skip_line_feeds()
+        while len(self._buffer) < BINARY_HEADER_LENGTH:
+            await self._fill()
+            self._skip_line_feeds()
+        length = codec.binary_frame_length(self._buffer)
+        while len(self._buffer) < length:
+            await self._fill()
+        return self._take(length)
+
+    async def read_ascii(self) -> bytes:
+        """Read one carriage return terminated ASCII reply."""
+        while True:
+            self._skip_line_feeds()
+            end = self._buffer.find(ASCII_TERMINATOR)
+            if end >= 0:
+                return self._take(end + 1)
+            await self._fill()
+
+    async def read_reply(self, command: bytes) -> bytes:
+        """Read the reply frame matching the protocol of a command."""
+        if codec.is_ascii_command(command):
+            return await self.read_ascii()
+        return await self.read_binary()
+
+
+class _PriorityLock:
+    """Lock handing the projector session to the most urgent waiter first.
+
+    Waiters with the same priority are served in arrival order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the lock."""
+        self._locked = False
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until the lock is granted to this caller."""
+        if not self._locked and not self._waiters:
+            self._locked = True
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before being cancelled, pass it on.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Hand the lock to the next waiter, or unlock it."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._locked = False
 
 
 class NecProjectorApi:
     """API to control an NEC projector."""
 
     def __init__(
-        self, host: str, port: int = DEFAULT_PORT, timeout: int = DEFAULT_TIMEOUT
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        timeout: int = DEFAULT_TIMEOUT,
+        idle_timeout: int = DEFAULT_IDLE_TIMEOUT,
+        connect_timeout: int = DEFAULT_CONNECT_TIMEOUT,
+        pipelining: bool = True,
+        trace_size: int = 0,
     ) -> None:
         """Initialize the API."""
         self._host = host
         self._port = port
         self._timeout = timeout
+        self._connect_timeout = connect_timeout
+        self._idle_timeout = idle_timeout
+        self._reader: _FrameReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._lock = _PriorityLock()
+        self._queued_polls: dict[bytes, asyncio.Future[bytes]] = {}
+        self._round_trips: dict[str, RoundTripEstimator] = {}
+        self.session_resets = 0
+        self.stats = NecProjectorApiStats()
+        self.circuit = CircuitBreaker()
+        self.pipelining = pipelining
+        self._pipelining_failures = 0
+        self.trace = ProtocolTrace(trace_size) if trace_size else None
+
+    @property
+    def connected(self) -> bool:
+        """Return True if a session to the projector is currently open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _async_connect(self) -> None:
+        """Open a new session to the projector."""
+        async with asyncio.timeout(self._connect_timeout):
+            reader, writer = await asyncio.open_connection(self._host, self._port)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.stats.sockets_opened += 1
+        self._reader = _FrameReader(reader)
+        self._writer = writer
+        LOGGER.debug("Opened session to %s:%s", self._host, self._port)
 
-    async def _send_command(self, command: bytes) -> bytes:
-        """Send a command to the projector and return the response."""
+    def _close_connection(self) -> None:
+        """Drop the current session, if any."""
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._writer is not None:
+            self._writer.close()
+            LOGGER.debug("Closed session to %s:%s", self._host, self._port)
+        self._reader = None
+        self._writer = None
+
+    def _reset_connection(self) -> None:
+        """Drop a session that failed or was lost unexpectedly."""
+        self._close_connection()
+        self.session_resets += 1
+
+    def _schedule_idle_close(self) -> None:
+        """Close the session once it has been idle for too long."""
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        self._idle_handle = asyncio.get_running_loop().call_later(
+            self._idle_timeout, self._close_connection
+        )
+
+    @property
+    def reply_timeouts(self) -> dict[str, float]:
+        """Return the current reply timeout of each kind of command."""
+        return {
+            kind: round(estimator.timeout(MIN_REPLY_TIMEOUT, self._timeout), 3)
+            for kind, estimator in self._round_trips.items()
+        }
+
+    def _reply_timeout(self, kind: str) -> float:
+        """Return the reply timeout of a kind of command.
+
+        The timeout follows the observed round trip time of the command, so
+        an unresponsive projector is detected long before the configured
+        timeout, which remains the upper bound.
+        """
+        if (estimator := self._round_trips.get(kind)) is None:
+            return self._timeout
+        return estimator.timeout(MIN_REPLY_TIMEOUT, self._timeout)
+
+    async def _exchange(self, commands: Sequence[bytes]) -> list[tuple[bytes, float]]:
+        """Write commands on the session and read their replies in order.
+
+        The commands are written back to back and each reply is returned with
+        the time elapsed since the write. Each reply must arrive within the
+        reply timeout of its command, counted from the previous reply, so a
+        slow but steady projector is not cut off in a long batch. A pooled
+        session may have been dropped by the projector while idle, so a
+        failure on a reused session is retried once on a fresh connection as
+        long as no reply was read.
+        """
+        while True:
+            reused = self.connected
+            if not reused:
+                try:
+                    await self._async_connect()
+                except TimeoutError as exc:
+                    self.stats.connect_timeouts += 1
+                    raise ProjectorConnectionError(
+                        f"Timeout connecting to {self._host}:{self._port}"
+                    ) from exc
+                except OSError as exc:
+                    raise ProjectorConnectionError(
+                        f"Error connecting to {self._host}:{self._port}"
+                    ) from exc
+            replies: list[tuple[bytes, float]] = []
+            trace = self.trace
+            try:
+                start = time.monotonic()
+                for command in commands:
+                    kind = codec.command_type(command)
+                    async with asyncio.timeout(self._reply_timeout(kind)):
+                        if not replies:
+                            self._writer.write(b"".join(commands))
+                            await self._writer.drain()
+                        response = await self._reader.read_reply(command)
+                    latency = time.monotonic() - start
+                    if trace is not None:
+                        trace.record(command, response, latency)
+                    if not codec.reply_matches(command, response):
+                        raise ProjectorCommandError(
+                            f"Reply does not match the command: {response!r}"
+                        )
+                    replies.append((response, latency))
+            except TimeoutError as exc:
+                self.stats.read_timeouts += 1
+                if trace is not None:
+                    trace.record(command, b"", time.monotonic() - start)
+                # Wait the full configured timeout again until new samples arrive.
+                self._round_trips.pop(kind, None)
+                self._reset_connection()
+                raise ProjectorConnectionError(
+                    f"Timeout waiting for reply from {self._host}:{self._port}"
+                ) from exc
+            except ProjectorCommandError:
+                self.stats.parse_failures += 1
+                self._reset_connection()
+                raise
+            except (ConnectionRefusedError, OSError) as exc:
+                self._reset_connection()
+                if reused and not replies:
+                    self.stats.retries += 1
+                    LOGGER.debug("Stale session to %s, reconnecting", self._host)
+                    continue
+                raise ProjectorConnectionError(
+                    f"Error connecting to {self._host}:{self._port}"
+                ) from exc
+            # Later replies of a batch also wait for the commands before them,
+            # so only the first one measures a round trip.
+            kind = codec.command_type(commands[0])
+            if (estimator := self._round_trips.get(kind)) is None:
+                estimator = self._round_trips[kind] = RoundTripEstimator()
+            estimator.record(replies[0][1])
+            return replies
+
+    def _check_circuit(self) -> None:
+        """Fail fast while the circuit to the projector is open."""
+        if self.circuit.state == STATE_OPEN:
+            self.stats.fast_failures += 1
+            raise ProjectorConnectionError(
+                f"{self._host}:{self._port} is unreachable, "
+                f"retrying in {self.circuit.retry_in:.0f} s"
+            )
+
+    async def _guarded_exchange(
+        self, commands: Sequence[bytes], record_failures: bool = True
+    ) -> list[tuple[bytes, float]]:
+        """Exchange a command, updating the circuit breaker with the outcome.
+
+        Only connection failures count against the circuit, unless
+        ``record_failures`` is False; a rejected or malformed reply still
+        proves the projector is reachable.
+        """
         try:
-            async with asyncio.timeout(self._timeout):
-                reader, writer = await asyncio.open_connection(self._host, self._port)
-                writer.write(command)
-                await writer.drain()
-                response = await reader.read(4096)
-                writer.close()
+            replies = await self._exchange(commands)
+        except ProjectorConnectionError:
+            if record_failures and self.circuit.record_failure():
+                self.stats.circuit_opens += 1
+                LOGGER.warning(
+                    "%s is unreachable, failing fast for %s s",
+                    self._host,
+                    self.circuit.backoff,
+                )
+            raise
+        except ProjectorCommandError:
+            self._record_reachable()
+            raise
+        self._record_reachable()
+        return replies
+
+    def _record_reachable(self) -> None:
+        """Close the circuit after a successful exchange."""
+        if self.circuit.record_success():
+            LOGGER.info("%s is reachable again", self._host)
+
+    async def _send_command(
+        self, command: bytes, priority: int = PRIORITY_USER
+    ) -> bytes:
+        """Send a command to the projector and return the response.
+
+        Commands are serialized per projector. User commands jump ahead of
+        queued polls, and a poll query that is already waiting in the queue is
+        shared with later callers instead of being sent twice.
+        """
+        self._check_circuit()
+        if priority < PRIORITY_POLL:
+            return await self._send_serialized(command, priority)
+
+        task = self._queued_polls.get(command)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._send_serialized(
+                    command, priority, lambda: self._forget_poll(command, task)
+                )
+            )
+            self._queued_polls[command] = task
+            task.add_done_callback(lambda done: self._forget_poll(command, done))
+        return await asyncio.shield(task)
+
+    def _forget_poll(self, command: bytes, task: asyncio.Future) -> None:
+        """Stop sharing a poll query once it has left the queue."""
+        if self._queued_polls.get(command) is task:
+            del self._queued_polls[command]
+        if task.done() and not task.cancelled():
+            # Retrieve the exception in case every waiter was cancelled.
+            task.exception()
+
+    @contextlib.asynccontextmanager
+    async def _async_session(
+        self,
+        priority: int,
+        first_command: bytes,
+        on_start: Callable[[], None] | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold the session for exchanges starting with a command.
+
+        If the circuit is half open, the projector is probed with the cheapest
+        query first.
+        """
+        await self._lock.acquire(priority)
+        try:
+            if on_start is not None:
+                on_start()
+            # The circuit may have opened while this command was queued.
+            self._check_circuit()
+            if self._idle_handle is not None:
+                self._idle_handle.cancel()
+                self._idle_handle = None
+            try:
+                if (
+                    self.circuit.state == STATE_HALF_OPEN
+                    and first_command != CMD_STATUS_QUERY
+                ):
+                    await self._guarded_exchange((CMD_STATUS_QUERY,))
+                yield
+            except asyncio.CancelledError:
+                # The reply may still be in flight; never reuse a half-read session.
+                self._reset_connection()
+                raise
+            self._schedule_idle_close()
+        finally:
+            self._lock.release()
+
+    async def _send_serialized(
+        self, command: bytes, priority: int, on_start: Callable[[], None] | None = None
+    ) -> bytes:
+        """Wait for the session and exchange one command on it."""
+        async with self._async_session(priority, command, on_start):
+            start = time.monotonic()
+            [(response, _)] = await self._guarded_exchange((command,))
+            self.stats.record_latency(
+                codec.command_type(command), time.monotonic() - start
+            )
+            return response
+
+    async def _exchange_sequentially(
+        self, commands: Sequence[bytes], priority: int, record_failures: bool = True
+    ) -> list[tuple[bytes, float]]:
+        """Exchange commands one at a time, timing each from its own write.
+
+        The session is taken for each command, so more urgent commands get in
+        between the queries.
+        """
+        replies = []
+        for command in commands:
+            async with self._async_session(priority, command):
+                replies.extend(
+                    await self._guarded_exchange((command,), record_failures)
+                )
+        return replies
+
+    async def async_query_batch(
+        self,
+        queries: Sequence[Query],
+        priority: int = PRIORITY_POLL,
+        record_failures: bool = True,
+    ) -> list[QueryResult]:
+        """Send several queries at once and return their parsed replies in order.
+
+        The queries are pipelined on the session so the batch costs about one
+        round trip plus the processing time of the projector. If a pipelined
+        batch fails, the queries are sent again one at a time, letting user
+        commands in between them; only a failure of those counts against the
+        circuit.
+        Pipelining is disabled for this projector once
+        PIPELINING_FAILURE_THRESHOLD batches in a row failed pipelined but
+        succeeded one at a time. A reply that cannot be parsed only fails its
+        own query; connection errors fail the whole batch.
+
+        Ad-hoc queries that the projector may not answer pass
+        ``record_failures=False``: their failures neither count against the
+        circuit nor towards disabling pipelining.
+        """
+        commands = [command for command, _ in queries]
+        self._check_circuit()
+        replies = None
+        if self.pipelining and len(commands) > 1:
+            async with self._async_session(priority, commands[0]):
+                try:
+                    replies = await self._guarded_exchange(commands, False)
+                except (ProjectorConnectionError, ProjectorCommandError) as exc:
+                    LOGGER.debug("Pipelined queries to %s failed: %s", self._host, exc)
+            if replies is not None and record_failures:
+                self._pipelining_failures = 0
+        if replies is None:
+            replies = await self._exchange_sequentially(
+                commands, priority, record_failures
+            )
+            if record_failures and self.pipelining and len(commands) > 1:
+                self._pipelining_failures += 1
+                if self._pipelining_failures >= PIPELINING_FAILURE_THRESHOLD:
+                    LOGGER.info(
+                        "%s does not support pipelined queries, sending them one at a time",
+                        self._host,
+                    )
+                    self.pipelining = False
+
+        results = []
+        for (command, parser), (response, latency) in zip(queries, replies):
+            self.stats.record_latency(codec.command_type(command), latency)
+            try:
+                results.append(QueryResult(self._decode(parser, response), None, latency))
+            except ProjectorCommandError as exc:
+                results.append(QueryResult(None, exc, latency))
+        return results
+
+    async def async_send_synchronized(
+        self, command: bytes, ready: Callable[[], None], release: asyncio.Event
+    ) -> tuple[float, float]:
+        """Send a command at a moment shared with other projectors.
+
+        The session is taken and warmed up with a status query first, so
+        nothing is left to connect or queue once ``release`` is set. ``ready``
+        is called when the command only waits for the release. Returns the
+        monotonic times the command was written and its reply received.
+        """
+        self._check_circuit()
+        async with self._async_session(PRIORITY_USER, CMD_STATUS_QUERY):
+            await self._guarded_exchange((CMD_STATUS_QUERY,))
+            ready()
+            await release.wait()
+            written = time.monotonic()
+            [(_, latency)] = await self._guarded_exchange((command,))
+            self.stats.record_latency(codec.command_type(command), latency)
+            return written, written + latency
+
+    async def async_close(self) -> None:
+        """Close the session to the projector."""
+        writer = self._writer
+        self._close_connection()
+        if writer is not None:
+            try:
                 await writer.wait_closed()
-                return response
-        except TimeoutError as exc:
-            raise ProjectorConnectionError(
-                f"Timeout connecting to {self._host}:{self._port}"
-            ) from exc
-        except (ConnectionRefusedError, OSError) as exc:
-            raise ProjectorConnectionError(
-                f"Error connecting to {self._host}:{self._port}"
-            ) from exc
+            except OSError:
+                pass
+
+    def _decode(self, decoder: Callable, response: bytes):
+        """Decode a reply, counting replies that cannot be parsed.
+
+        A reply that does not decode because it is an error reply raises
+        ProjectorRejectedError instead, which is not a parse failure: the
+        projector understood the command and refused it.
+        """
+        try:
+            return decoder(response)
+        except ProjectorCommandError:
+            codec.check_reply(response)
+            self.stats.parse_failures += 1
+            raise
 
     async def async_power_on(self) -> None:
         """Turn the projector on."""
@@ -63,88 +690,82 @@ class NecProjectorApi:
         await self._send_command(CMD_POWER_OFF)
 
     async def async_open_shutter(self) -> None:
-        """Turn the projector on."""
-        command = CMD_SHUTTER.format(shutter_arg="open").encode("ascii")
-        await self._send_command(command)
+        """Open the projector shutter."""
+        await self._send_command(CMD_SHUTTER_OPEN)
 
     async def async_close_shutter(self) -> None:
-        """Turn the projector off."""
-        command = CMD_SHUTTER.format(shutter_arg="close").encode("ascii")
-        await self._send_command(command)
+        """Close the projector shutter."""
+        await self._send_command(CMD_SHUTTER_CLOSE)
 
-    async def async_get_shutter_status(self) -> dict[str, bool]:
-        """Turn the projector off."""
-        command = CMD_SHUTTER.format(shutter_arg="?").encode("ascii")
-        response = await self._send_command(command)
-        shutter_value = re.search("(?<=cur\\=)\\w+", response.decode())
-        if not shutter_value:
-            raise ProjectorCommandError(
-                "Invalid shutter status response from projector"
-            )
-        return {"shutter_status": shutter_value.group()}
+    async def _async_query(self, query: Query, priority: int) -> dict:
+        """Send a single query and return its parsed reply."""
+        command, parser = query
+        response = await self._send_command(command, priority)
+        return self._decode(parser, response)
+
+    async def async_get_shutter_status(
+        self, priority: int = PRIORITY_POLL
+    ) -> dict[str, str]:
+        """Get the shutter status of the projector."""
+        return await self._async_query(SHUTTER_QUERY, priority)
 
-    async def async_get_status(self) -> dict[str, bool]:
+    async def async_get_status(
+        self, priority: int = PRIORITY_POLL
+    ) -> dict[str, bool | ProjectorStatus | int]:
         """Get the power status of the projector."""
-        response = await self._send_command(CMD_STATUS_QUERY)
+        return await self._async_query(STATUS_QUERY, priority)
 
-        if not response or response[0] != 0x20 or response[1] != 0x85:
-            raise ProjectorCommandError("Invalid status response from projector")
+    async def async_get_input_status(
+        self, priority: int = PRIORITY_POLL
+    ) -> dict[str, int]:
+        """Get the selected input terminal from the binary input status."""
+        return await self._async_query(INPUT_STATUS_QUERY, priority)
 
-        # DATA03 indicates power status: 0x01 is Power On
-        power_on = response[7] == 0x01
+    async def async_get_mute_status(
+        self, priority: int = PRIORITY_POLL
+    ) -> dict[str, bool]:
+        """Get the picture, sound and onscreen mute status."""
+        return await self._async_query(MUTE_STATUS_QUERY, priority)
 
-        status = {
-            0x00: "Standby (Sleep)",
-            0x04: "Power on",
-            0x05: "Cooling",
-            0x06: "Standby (error)",
-            0x0f: "Standby (Power saving)",
-            0x10: "Network standby",
-            0xff: "Not supported"
-        }.get(response[10], "Invalid status")
+    async def async_get_lamp_usage(
+        self, priority: int = PRIORITY_POLL
+    ) -> dict[str, float]:
+        """Get the lamp usage time in hours."""
+        return await self._async_query(LAMP_USAGE_QUERY, priority)
 
-        return {"power_on": power_on, "status": status}
+    async def async_get_filter_usage(
+        self, priority: int = PRIORITY_POLL
+    ) -> dict[str, float]:
+        """Get the filter usage time in hours."""
+        return await self._async_query(FILTER_USAGE_QUERY, priority)
 
-    async def async_get_lens_value(self, lens_subcommand: str) -> dict[str, str]:
-        command = CMD_LENS.format(lens_subcmd=lens_subcommand, lens_arg="?").encode("ascii")
-        response = await self._send_command(command)
-        decoded_response = response.decode()
-        lens_value = re.search("(?<=cur\\=)\\d+", decoded_response)
-        max_value = re.search("(?<=max\\=)\\d+", decoded_response)
-        min_value = re.search("(?<=min\\=)\\d+", decoded_response)
-        if not lens_value or not max_value or not min_value:
-            raise ProjectorCommandError(
-                f"Invalid lens response for {lens_subcommand} from projector: {decoded_response}"
-            )
-        return {
-            f"{lens_subcommand}_value": lens_value.group(),
-            f"{lens_subcommand}_max": max_value.group(),
-            f"{lens_subcommand}_min": min_value.group(),
-        }
+    async def async_get_lens_value(self, lens_subcommand: str) -> dict[str, int]:
+        """Get the current position and range of a lens axis."""
+        return await self._async_query(lens_query(lens_subcommand, True), PRIORITY_POLL)
+
+    async def async_get_lens_position(
+        self, lens_subcommand: str, priority: int = PRIORITY_POLL
+    ) -> dict[str, int]:
+        """Get only the current position of a lens axis."""
+        return await self._async_query(lens_query(lens_subcommand), priority)
 
     async def async_set_lens_value(self, lens_subcommand: str, lens_value: int) -> None:
-        command = CMD_LENS.format(lens_subcmd=lens_subcommand, lens_arg=lens_value).encode("ascii")
-        await self._send_command(command)
+        """Move a lens axis to a position."""
+        await self._send_command(codec.lens_set(lens_subcommand, lens_value))
 
-    async def async_get_input_options(self) -> dict[str, str | list[str]]:
-        command = CMD_INPUT.format(input_arg="?").encode("ascii")
-        response = await self._send_command(command)
-        decoded_response = response.decode()
-        input_value = re.search("(?<=cur\\=)\\w+", decoded_response)
-        input_options = re.search("(?<=sel\\=)[\\w|]+", decoded_response)
-
-        input_value = input_value.group() if input_value else ""
-        input_options = input_options.group() if input_options else ""
-        input_options = input_options.split("|")
-        
-        return {
-            "input_value": input_value,
-            "input_options": input_options
-        }
+    async def async_get_input_options(self) -> dict[str, str | tuple[str, ...]]:
+        """Get the current input and the available inputs."""
+        return await self._async_query(INPUT_OPTIONS_QUERY, PRIORITY_POLL)
+
+    async def async_get_input_value(
+        self, priority: int = PRIORITY_POLL
+    ) -> dict[str, str]:
+        """Get only the currently selected input."""
+        return await self._async_query(INPUT_QUERY, priority)
 
     async def async_set_input_option(self, input_value: str) -> None:
-        command = CMD_INPUT.format(input_arg=input_value).encode("ascii")
-        await self._send_command(command)
+        """Select an input."""
+        await self._send_command(codec.input_set(input_value))
 
     async def async_test_connection(self) -> bool:
         """Test the connection to the projector."""
@@ -163,8 +784,5 @@ class NecProjectorApi:
 
     async def async_send_custom_ascii_command(self, command_str: str) -> str:
         """Send a custom ASCII command to the projector."""
-        if not command_str.endswith("\r"):
-            command_str += "\r"
-        command_bytes = command_str.encode("ascii")
-        response = await self._send_command(command_bytes)
+        response = await self._send_command(codec.ascii_command(command_str))
         return response.decode()
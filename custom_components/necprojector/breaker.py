@@ -0,0 +1,115 @@
+"""Circuit breaker and reply timeout estimation for the NEC Projector integration."""
+
+import time
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_BACKOFF,
+    CIRCUIT_MIN_BACKOFF,
+)
+
+# Circuit states
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Smoothing gains of the round trip time estimator, as in RFC 6298
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+
+
+class CircuitBreaker:
+    """Stop talking to a projector that keeps failing.
+
+    After a number of consecutive connection failures the circuit opens and
+    commands fail immediately. Once the backoff delay has passed the circuit
+    is half open: the next exchange probes the projector, closing the circuit
+    on success or opening it again for twice as long on failure.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        min_backoff: float = CIRCUIT_MIN_BACKOFF,
+        max_backoff: float = CIRCUIT_MAX_BACKOFF,
+    ) -> None:
+        """Initialize a closed circuit."""
+        self.threshold = threshold
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.backoff = 0.0
+        self._retry_at = 0.0
+
+    @property
+    def tripped(self) -> bool:
+        """Return True if the circuit is open or half open."""
+        return self.failures >= self.threshold
+
+    @property
+    def state(self) -> str:
+        """Return the current circuit state."""
+        if not self.tripped:
+            return STATE_CLOSED
+        if time.monotonic() < self._retry_at:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds left before the next probe is allowed."""
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def record_success(self) -> bool:
+        """Close the circuit, return True if it was tripped."""
+        tripped = self.tripped
+        self.failures = 0
+        self.backoff = 0.0
+        return tripped
+
+    def record_failure(self) -> bool:
+        """Count a failure, return True if it just opened the circuit."""
+        self.failures += 1
+        if not self.tripped:
+            return False
+        if self.backoff:
+            self.backoff = min(self.max_backoff, self.backoff * 2)
+        else:
+            self.backoff = self.min_backoff
+        self._retry_at = time.monotonic() + self.backoff
+        return self.failures == self.threshold
+
+    def as_dict(self) -> dict:
+        """Return the circuit state as a serializable dict."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "backoff": self.backoff,
+            "retry_in": round(self.retry_in, 3),
+        }
+
+
+class RoundTripEstimator:
+    """Smoothed round trip time of one kind of command."""
+
+    __slots__ = ("rttvar", "srtt")
+
+    def __init__(self) -> None:
+        """Initialize an estimator without samples."""
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+
+    def record(self, rtt: float) -> None:
+        """Record the round trip time of one exchange in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+            return
+        self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+        self.srtt += RTT_ALPHA * (rtt - self.srtt)
+
+    def timeout(self, minimum: float, maximum: float) -> float:
+        """Return the reply timeout, or the maximum without samples."""
+        if self.srtt is None:
+            return maximum
+        return min(maximum, max(minimum, self.srtt + 4 * self.rttvar))
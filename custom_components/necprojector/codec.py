@@ -0,0 +1,343 @@
+"""Protocol codec for NEC projectors.
+
+This module performs no I/O. It builds command frames and decodes reply
+frames of both the binary and the ASCII control protocol, so it can be used
+by the API, by tests and by offline tools alike.
+"""
+
+import struct
+from typing import NamedTuple
+
+from .const import (
+    FIELD_INPUT,
+    FIELD_POWER,
+    FIELD_SHUTTER,
+    LENS_AXES,
+    ProjectorStatus,
+)
+
+# NEC Projector Commands (Hex Bytes)
+CMD_POWER_ON = b"\x02\x00\x00\x00\x00\x02"
+CMD_POWER_OFF = b"\x02\x01\x00\x00\x00\x03"
+CMD_STATUS_QUERY = b"\x00\x85\x00\x00\x01\x01\x87"
+CMD_INPUT_STATUS_QUERY = b"\x00\x85\x00\x00\x01\x02\x88"
+CMD_MUTE_STATUS_QUERY = b"\x00\x85\x00\x00\x01\x03\x89"
+CMD_FILTER_USAGE_QUERY = b"\x03\x95\x00\x00\x00\x98"
+CMD_LAMP_USAGE_QUERY = b"\x03\x96\x00\x00\x02\x00\x01\x9c"
+# NEC Projector Commands (ASCII)
+CMD_SHUTTER_OPEN = b"shutter open\r"
+CMD_SHUTTER_CLOSE = b"shutter close\r"
+CMD_SHUTTER_QUERY = b"shutter ?\r"
+CMD_INPUT_QUERY = b"input ?\r"
+CMD_LENS_QUERY = {axis: f"lens {axis} ?\r".encode("ascii") for axis in LENS_AXES}
+
+# Reply framing
+BINARY_HEADER_LENGTH = 5
+ASCII_TERMINATOR = b"\r"
+
+# Binary reply types
+REPLY_STATUS = b"\x20\x85"
+REPLY_FILTER_USAGE = b"\x23\x95"
+REPLY_LAMP = b"\x23\x96"
+
+# DATA layouts of binary replies
+RUNNING_STATUS = struct.Struct("2x4B")
+INPUT_STATUS = struct.Struct("4B")
+MUTE_STATUS = struct.Struct("3B")
+FILTER_USAGE = struct.Struct("<i")
+LAMP_INFO = struct.Struct("<2Bi")
+
+# DATA06 of the status reply
+STATUS_NAMES = {
+    0x00: ProjectorStatus.STANDBY,
+    0x04: ProjectorStatus.POWER_ON,
+    0x05: ProjectorStatus.COOLING,
+    0x06: ProjectorStatus.STANDBY_ERROR,
+    0x0F: ProjectorStatus.POWER_SAVING,
+    0x10: ProjectorStatus.NETWORK_STANDBY,
+    0xFF: ProjectorStatus.NOT_SUPPORTED,
+}
+STATUS_INVALID = ProjectorStatus.INVALID
+
+
+class ProjectorCommandError(Exception):
+    """Exception to indicate a command error."""
+
+
+class ProjectorRejectedError(ProjectorCommandError):
+    """Exception to indicate the projector answered a command with an error."""
+
+
+class RunningStatus(NamedTuple):
+    """Decoded reply to the running status request."""
+
+    power_on: bool
+    cooling: bool
+    power_process: bool
+    status: ProjectorStatus
+
+
+class InputStatus(NamedTuple):
+    """Decoded reply to the input status request."""
+
+    switching: bool
+    signal_list: int
+    terminal: int
+    terminal_type: int
+
+
+class MuteStatus(NamedTuple):
+    """Decoded reply to the mute status request."""
+
+    picture: bool
+    sound: bool
+    onscreen: bool
+
+
+def is_ascii_command(command: bytes) -> bool:
+    """Return True if a command belongs to the ASCII protocol."""
+    return command[:1].isalpha()
+
+
+def command_type(command: bytes) -> str:
+    """Return a short label grouping commands of the same kind.
+
+    ASCII commands are labelled by their first word, with a trailing "?" for
+    queries. Binary commands are labelled by the hex of their two command
+    bytes.
+    """
+    if is_ascii_command(command):
+        words = command.split()
+        label = words[0].decode("ascii", "replace")
+        return f"{label}?" if words[-1] == b"?" else label
+    return command[:2].hex()
+
+
+def command_fields(command: bytes) -> tuple[str, ...] | None:
+    """Return the coordinator fields a command can change.
+
+    Returns None when the effect of the command is unknown, an empty tuple
+    for read-only queries.
+    """
+    if not is_ascii_command(command):
+        if command[:1] == b"\x00":
+            # Binary commands of the 0x00 group are status requests.
+            return ()
+        if command[:2] in (CMD_FILTER_USAGE_QUERY[:2], CMD_LAMP_USAGE_QUERY[:2]):
+            return ()
+        if command[:1] == b"\x02" and command[1:2] in (b"\x00", b"\x01"):
+            return (FIELD_POWER,)
+        return None
+    words = command.decode("ascii", "replace").split()
+    if words[-1] == "?":
+        return ()
+    if words[0] in (FIELD_POWER, FIELD_SHUTTER, FIELD_INPUT):
+        return (words[0],)
+    if words[0] == "lens" and len(words) > 1 and words[1] in LENS_AXES:
+        return (words[1],)
+    return None
+
+
+def binary_frame_length(header: bytes | bytearray) -> int:
+    """Return the full length of a binary frame from its header."""
+    return BINARY_HEADER_LENGTH + header[4] + 1
+
+
+def checksum(frame: bytes | bytearray) -> int:
+    """Return the checksum of a binary frame without its checksum byte."""
+    return sum(frame) & 0xFF
+
+
+def verify_binary_reply(reply: bytes, expected: bytes) -> None:
+    """Check the reply type, length and checksum of a binary reply."""
+    length = len(reply)
+    if (
+        length <= BINARY_HEADER_LENGTH
+        or not reply.startswith(expected)
+        or length != BINARY_HEADER_LENGTH + reply[4] + 1
+        or (sum(reply) - reply[-1]) & 0xFF != reply[-1]
+    ):
+        raise ProjectorCommandError(f"Invalid binary reply from projector: {reply.hex()}")
+
+
+def reply_matches(command: bytes, reply: bytes) -> bool:
+    """Return True if a reply can be the answer to a command.
+
+    Binary replies repeat the command bytes, with the reply type in the high
+    nibble of the first one. ASCII replies start with a letter.
+    """
+    if is_ascii_command(command):
+        return reply[:1].isalpha()
+    return (
+        len(reply) > 1
+        and reply[0] & 0x0F == command[0] & 0x0F
+        and reply[1] == command[1]
+    )
+
+
+def is_error_reply(reply: bytes) -> bool:
+    """Return True if a reply reports that the projector rejected a command.
+
+    Binary error replies carry 0xA in the high nibble of the first byte and
+    must be complete frames with a valid checksum, so that a garbled reply is
+    not mistaken for one. ASCII error replies start with "err".
+    """
+    if reply[:1].isalpha():
+        return reply.startswith(b"err")
+    return (
+        len(reply) > BINARY_HEADER_LENGTH
+        and reply[0] & 0xF0 == 0xA0
+        and len(reply) == binary_frame_length(reply)
+        and checksum(reply[:-1]) == reply[-1]
+    )
+
+
+def check_reply(reply: bytes) -> None:
+    """Raise ProjectorRejectedError if a reply reports a rejected command."""
+    if is_error_reply(reply):
+        if reply[:1].isalpha():
+            text = reply.decode("ascii", "replace").strip()
+        else:
+            text = reply.hex()
+        raise ProjectorRejectedError(f"Command rejected by projector: {text}")
+
+
+def _unpack_binary(reply: bytes, expected: bytes, layout: struct.Struct) -> tuple:
+    """Check a binary reply and unpack the start of its data."""
+    verify_binary_reply(reply, expected)
+    if reply[4] < layout.size:
+        raise ProjectorCommandError(f"Short binary reply from projector: {reply.hex()}")
+    return layout.unpack_from(reply, BINARY_HEADER_LENGTH)
+
+
+def lens_query(axis: str) -> bytes:
+    """Return the query command of a lens axis."""
+    if (command := CMD_LENS_QUERY.get(axis)) is not None:
+        return command
+    return f"lens {axis} ?\r".encode("ascii")
+
+
+def lens_set(axis: str, value: int) -> bytes:
+    """Return the command moving a lens axis to a position."""
+    return b"lens %s %d\r" % (axis.encode("ascii"), value)
+
+
+def input_set(value: str) -> bytes:
+    """Return the command selecting an input."""
+    return f"input {value}\r".encode("ascii")
+
+
+def ascii_command(command: str) -> bytes:
+    """Return a free-form ASCII command with its terminator."""
+    if not command.endswith("\r"):
+        command += "\r"
+    return command.encode("ascii")
+
+
+def parse_fields(reply: bytes) -> dict[str, str]:
+    """Parse the key=value fields of an ASCII reply in a single pass."""
+    fields = {}
+    for token in reply.decode("ascii", "replace").split():
+        key, separator, value = token.partition("=")
+        if separator:
+            fields[key] = value
+    return fields
+
+
+def decode_running_status(reply: bytes) -> RunningStatus:
+    """Decode DATA03 to DATA06 of a running status reply."""
+    power, cooling, power_process, status = _unpack_binary(
+        reply, REPLY_STATUS, RUNNING_STATUS
+    )
+    return RunningStatus(
+        power == 0x01,
+        cooling == 0x01,
+        power_process == 0x01,
+        STATUS_NAMES.get(status, STATUS_INVALID),
+    )
+
+
+def decode_status(reply: bytes) -> tuple[bool, ProjectorStatus, int]:
+    """Decode a status reply into power state, status name and model code.
+
+    This is the polled subset of the running status, decoded without the
+    intermediate tuple.
+    """
+    verify_binary_reply(reply, REPLY_STATUS)
+    if reply[4] < RUNNING_STATUS.size:
+        raise ProjectorCommandError("Invalid status response from projector")
+    # DATA03 indicates power status: 0x01 is Power On
+    return reply[7] == 0x01, STATUS_NAMES.get(reply[10], STATUS_INVALID), reply[3]
+
+
+def decode_input_status(reply: bytes) -> InputStatus:
+    """Decode the selected input terminal of an input status reply."""
+    switching, signal_list, terminal, terminal_type = _unpack_binary(
+        reply, REPLY_STATUS, INPUT_STATUS
+    )
+    return InputStatus(switching == 0x01, signal_list, terminal, terminal_type)
+
+
+def decode_mute_status(reply: bytes) -> MuteStatus:
+    """Decode the picture, sound and onscreen mute of a mute status reply."""
+    picture, sound, onscreen = _unpack_binary(reply, REPLY_STATUS, MUTE_STATUS)
+    return MuteStatus(picture == 0x01, sound == 0x01, onscreen == 0x01)
+
+
+def decode_filter_usage(reply: bytes) -> int:
+    """Decode the filter usage time in seconds of a filter usage reply."""
+    (seconds,) = _unpack_binary(reply, REPLY_FILTER_USAGE, FILTER_USAGE)
+    if seconds < 0:
+        raise ProjectorCommandError("Filter usage not reported by projector")
+    return seconds
+
+
+def decode_lamp_usage(reply: bytes) -> int:
+    """Decode the lamp usage time in seconds of a lamp information reply."""
+    _, content, seconds = _unpack_binary(reply, REPLY_LAMP, LAMP_INFO)
+    if content != CMD_LAMP_USAGE_QUERY[6] or seconds < 0:
+        raise ProjectorCommandError("Lamp usage not reported by projector")
+    return seconds
+
+
+def decode_lens(reply: bytes) -> tuple[int, int, int]:
+    """Decode a lens reply into its current, maximum and minimum position."""
+    fields = parse_fields(reply)
+    values = (fields.get("cur", ""), fields.get("max", ""), fields.get("min", ""))
+    if not all(value.isdigit() for value in values):
+        raise ProjectorCommandError(
+            f"Invalid lens response from projector: {reply.decode('ascii', 'replace')}"
+        )
+    return int(values[0]), int(values[1]), int(values[2])
+
+
+def decode_lens_position(reply: bytes) -> int:
+    """Decode only the current position of a lens reply."""
+    value = parse_fields(reply).get("cur", "")
+    if not value.isdigit():
+        raise ProjectorCommandError(
+            f"Invalid lens response from projector: {reply.decode('ascii', 'replace')}"
+        )
+    return int(value)
+
+
+def decode_input_value(reply: bytes) -> str:
+    """Decode only the current input of an input reply."""
+    if (value := parse_fields(reply).get("cur")) is None:
+        raise ProjectorCommandError("Invalid input response from projector")
+    return value
+
+
+def decode_input(reply: bytes) -> tuple[str, tuple[str, ...]]:
+    """Decode an input reply into the current input and the input options."""
+    fields = parse_fields(reply)
+    if "cur" not in fields:
+        raise ProjectorCommandError("Invalid input response from projector")
+    return fields["cur"], tuple(fields.get("sel", "").split("|"))
+
+
+def decode_shutter(reply: bytes) -> str:
+    """Decode a shutter reply into the shutter state."""
+    if not (value := parse_fields(reply).get("cur")):
+        raise ProjectorCommandError("Invalid shutter status response from projector")
+    return value
@@ -1,12 +1,24 @@
 """Config flow for NEC Projector."""
 
 import voluptuous as vol
-
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
+from homeassistant.const import CONF_HOST, CONF_HOSTS, CONF_NAME, CONF_PORT
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 
 from .api import NecProjectorApi, ProjectorConnectionError
-from .const import DEFAULT_NAME, DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_MEMBERS,
+    CONF_NETWORK,
+    CONF_TRACE_SIZE,
+    DEFAULT_GROUP_NAME,
+    DEFAULT_NAME,
+    DEFAULT_PORT,
+    DISCOVERY_MAX_HOSTS,
+    DOMAIN,
+    TRACE_MAX_SIZE,
+)
+from .discovery import DiscoveredProjector, async_discover, network_hosts
 
 
 class NecProjectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -14,8 +26,31 @@ class NecProjectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow of an entry."""
+        return NecProjectorOptionsFlow()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry) -> bool:
+        """Return True for projector entries, groups have no options."""
+        return CONF_MEMBERS not in config_entry.data
+
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._port = DEFAULT_PORT
+        self._discovered: dict[str, DiscoveredProjector] = {}
+
     async def async_step_user(self, user_input=None):
-        """Handle the initial step."""
+        """Let the user add a projector by address, discover several or group them."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["manual", "discover", "group"]
+        )
+
+    async def async_step_manual(self, user_input=None):
+        """Handle a projector entered by address."""
         errors = {}
 
         if user_input is not None:
@@ -38,6 +73,8 @@ class NecProjectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "cannot_connect"
             except Exception:  # noqa: BLE001
                 errors["base"] = "unknown"
+            finally:
+                await api.async_close()
 
         data_schema = vol.Schema(
             {
@@ -48,5 +85,166 @@ class NecProjectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(
-            step_id="user", data_schema=data_schema, errors=errors
+            step_id="manual", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_discover(self, user_input=None):
+        """Scan a network for projectors."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                hosts = network_hosts(user_input[CONF_NETWORK])
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                if len(hosts) > DISCOVERY_MAX_HOSTS:
+                    errors[CONF_NETWORK] = "network_too_large"
+                else:
+                    configured = self._async_current_ids()
+                    self._port = user_input[CONF_PORT]
+                    found = await async_discover(
+                        [host for host in hosts if host not in configured], self._port
+                    )
+                    if found:
+                        self._discovered = {
+                            projector.host: projector for projector in found
+                        }
+                        return await self.async_step_select()
+                    errors["base"] = "no_devices_found"
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NETWORK): str,
+                vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="discover", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_select(self, user_input=None):
+        """Let the user pick the discovered projectors to add."""
+        errors = {}
+
+        if user_input is not None:
+            selected = user_input[CONF_HOSTS]
+            configured = self._async_current_ids()
+            hosts = [host for host in selected if host not in configured]
+            if not selected:
+                errors["base"] = "no_selection"
+            elif not hosts:
+                errors["base"] = "already_added"
+            else:
+                # A flow creates a single entry, the others get a discovery flow
+                # each, started in the background so that setting up their
+                # entries does not hold up this step.
+                skipped = [host for host in selected if host in configured]
+                for host in hosts[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                            data=self._entry_data(host),
+                        )
+                    )
+                await self.async_set_unique_id(hosts[0])
+                self._abort_if_unique_id_configured()
+                data = self._entry_data(hosts[0])
+                if not skipped:
+                    return self.async_create_entry(title=data[CONF_NAME], data=data)
+                return self.async_create_entry(
+                    title=data[CONF_NAME],
+                    data=data,
+                    description="partial",
+                    description_placeholders={
+                        "added": str(len(selected) - len(skipped)),
+                        "selected": str(len(selected)),
+                        "skipped": ", ".join(skipped),
+                    },
+                )
+
+        options = {
+            host: f"{host} (model {projector.model_code:#04x})"
+            for host, projector in self._discovered.items()
+        }
+        data_schema = vol.Schema(
+            {vol.Required(CONF_HOSTS, default=list(options)): cv.multi_select(options)}
         )
+
+        return self.async_show_form(
+            step_id="select",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={"count": str(len(options))},
+        )
+
+    async def async_step_group(self, user_input=None):
+        """Combine configured projectors into a group driven together."""
+        errors = {}
+        projectors = {
+            entry.entry_id: entry.title
+            for entry in self._async_current_entries(include_ignore=False)
+            if CONF_MEMBERS not in entry.data
+        }
+        if len(projectors) < 2:
+            return self.async_abort(reason="not_enough_projectors")
+
+        if user_input is not None:
+            members = sorted(user_input[CONF_MEMBERS])
+            if len(members) >= 2:
+                await self.async_set_unique_id(f"group_{'_'.join(members)}")
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={CONF_NAME: user_input[CONF_NAME], CONF_MEMBERS: members},
+                )
+            errors[CONF_MEMBERS] = "group_too_small"
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME, default=DEFAULT_GROUP_NAME): str,
+                vol.Required(CONF_MEMBERS, default=[]): cv.multi_select(projectors),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="group", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_integration_discovery(self, discovery_info):
+        """Add a projector selected in another flow's network scan."""
+        await self.async_set_unique_id(discovery_info[CONF_HOST])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=discovery_info[CONF_NAME], data=discovery_info
+        )
+
+    def _entry_data(self, host: str) -> dict:
+        """Return the entry data of a discovered projector."""
+        return {
+            CONF_HOST: host,
+            CONF_NAME: f"{DEFAULT_NAME} {host}",
+            CONF_PORT: self._port,
+        }
+
+
+class NecProjectorOptionsFlow(config_entries.OptionsFlow):
+    """Handle the options of a NEC Projector."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the protocol trace."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_TRACE_SIZE,
+                    default=self.config_entry.options.get(CONF_TRACE_SIZE, 0),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=TRACE_MAX_SIZE)),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
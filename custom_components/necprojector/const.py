@@ -1,19 +1,88 @@
 """Constants for the NEC Projector integration."""
 
 import logging
+from enum import StrEnum
 
 DOMAIN = "necprojector"
 LOGGER = logging.getLogger(__package__)
 
 # Platforms to be set up
 PLATFORMS = ["switch", "number", "sensor", "select"]
+GROUP_PLATFORMS = ["switch", "select"]
+
+# Lens axes exposed as number entities
+LENS_AXES = ("zoom", "focus", "h_shift", "v_shift")
+
+# Fields that can be refreshed on their own, besides the lens axes
+FIELD_POWER = "power"
+FIELD_SHUTTER = "shutter"
+FIELD_INPUT = "input"
+FIELD_LAMP = "lamp"
+FIELD_FILTER = "filter"
+CAPABILITY_PIPELINING = "pipelining"
 
 # Default values
 DEFAULT_NAME = "NEC Projector"
+DEFAULT_GROUP_NAME = "NEC Projector group"
 DEFAULT_PORT = 7142
 DEFAULT_TIMEOUT = 5
+DEFAULT_CONNECT_TIMEOUT = 3
+DEFAULT_IDLE_TIMEOUT = 120
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_STANDBY_SCAN_INTERVAL = 120
+DEFAULT_TRANSITION_SCAN_INTERVAL = 2
+POWER_TRANSITION_TIMEOUT = 90
+DEFAULT_MAX_CONCURRENT_POLLS = 16
+DEFAULT_MAX_CONCURRENT_COMMANDS = 32
+POLL_JITTER = 0.25
+STARTUP_REFRESH_WINDOW = 30
+LENS_SETTLE_DELAY = 0.3
+LENS_CONFIRM_DELAY = 1.0
+
+# Circuit breaker and adaptive reply timeouts
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_MIN_BACKOFF = 5
+CIRCUIT_MAX_BACKOFF = 120
+MIN_REPLY_TIMEOUT = 1.0
+PIPELINING_FAILURE_THRESHOLD = 3
+
+# Protocol trace
+CONF_TRACE_SIZE = "trace_size"
+TRACE_MAX_SIZE = 10000
+
+# Network discovery
+CONF_NETWORK = "network"
+DISCOVERY_CONNECT_TIMEOUT = 0.5
+DISCOVERY_TIMEOUT = 2
+DISCOVERY_MAX_CONCURRENT = 64
+DISCOVERY_MAX_HOSTS = 1024
+
+# Projector groups
+CONF_MEMBERS = "members"
+GROUP_READY_TIMEOUT = 5
+
+# Persisted last-known state
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Keys in hass.data[DOMAIN]
+DATA_SCHEDULER = "scheduler"
+DATA_DEVICES = "devices"
 
 # Service names
 SERVICE_SEND_COMMAND = "send_command"
 SERVICE_SEND_ASCII_COMMAND = "send_ascii_command"
+SERVICE_QUERY = "query"
+
+
+class ProjectorStatus(StrEnum):
+    """Operation status reported by the projector."""
+
+    STANDBY = "Standby (Sleep)"
+    POWER_ON = "Power on"
+    COOLING = "Cooling"
+    STANDBY_ERROR = "Standby (error)"
+    POWER_SAVING = "Standby (Power saving)"
+    NETWORK_STANDBY = "Network standby"
+    NOT_SUPPORTED = "Not supported"
+    INVALID = "Invalid status"
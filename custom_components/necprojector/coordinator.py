@@ -1,20 +1,104 @@
 """DataUpdateCoordinator for the NEC Projector integration."""
 
+import asyncio
+import time
 from datetime import timedelta
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import NecProjectorApi, ProjectorCommandError, ProjectorConnectionError
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, LOGGER
+from .api import (
+    FILTER_USAGE_QUERY,
+    INPUT_OPTIONS_QUERY,
+    INPUT_QUERY,
+    LAMP_USAGE_QUERY,
+    PRIORITY_USER,
+    SHUTTER_QUERY,
+    NecProjectorApi,
+    ProjectorCommandError,
+    ProjectorConnectionError,
+    ProjectorRejectedError,
+    Query,
+    lens_query,
+)
+from .const import (
+    CAPABILITY_PIPELINING,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STANDBY_SCAN_INTERVAL,
+    DEFAULT_TRANSITION_SCAN_INTERVAL,
+    DOMAIN,
+    FIELD_FILTER,
+    FIELD_INPUT,
+    FIELD_LAMP,
+    FIELD_POWER,
+    FIELD_SHUTTER,
+    LENS_AXES,
+    LENS_CONFIRM_DELAY,
+    LENS_SETTLE_DELAY,
+    LOGGER,
+    POWER_TRANSITION_TIMEOUT,
+    ProjectorStatus,
+)
+from .metadata import NecProjectorMetadata
+from .scheduler import NecProjectorPollScheduler
+from .state import EMPTY_STATE, NecProjectorState
 
+# Statuses of a projector that is off, whatever its power flag says. Other
+# statuses, including "not supported" and unknown codes, follow the flag.
+STANDBY_STATUSES = frozenset(
+    (
+        ProjectorStatus.STANDBY,
+        ProjectorStatus.COOLING,
+        ProjectorStatus.STANDBY_ERROR,
+        ProjectorStatus.POWER_SAVING,
+        ProjectorStatus.NETWORK_STANDBY,
+    )
+)
 
-class NecProjectorCoordinator(DataUpdateCoordinator):
+# Fields read by a full poll, besides the power status
+POLLED_FIELDS = (*LENS_AXES, FIELD_INPUT, FIELD_SHUTTER, FIELD_LAMP, FIELD_FILTER)
+
+# Polled fields that only report counters and are read with a binary query
+USAGE_QUERIES = {FIELD_LAMP: LAMP_USAGE_QUERY, FIELD_FILTER: FILTER_USAGE_QUERY}
+
+
+def field_key(field: str) -> str:
+    """Return the coordinator data key holding the value of a field."""
+    if field == FIELD_SHUTTER:
+        return "shutter_status"
+    if field == FIELD_INPUT:
+        return "input_value"
+    if field in USAGE_QUERIES:
+        return f"{field}_usage"
+    return f"{field}_value"
+
+
+class NecProjectorCoordinator(DataUpdateCoordinator[NecProjectorState]):
     """Manages polling for data from the NEC Projector."""
 
-    def __init__(self, hass, api: NecProjectorApi) -> None:
+    def __init__(
+        self, hass, api: NecProjectorApi, scheduler: NecProjectorPollScheduler
+    ) -> None:
         """Initialize the data update coordinator."""
         self.api = api
-        self.shutter_available = True
+        self.scheduler = scheduler
+        self._poll_interval = DEFAULT_SCAN_INTERVAL
+        self.capabilities: dict[str, bool] = {}
+        self.capabilities_model: int | None = None
+        self.stale_fields: set[str] = set()
+        self.metadata = NecProjectorMetadata()
+        self._power_session = 0
+        self._fully_polled = False
+        self._power_target: bool | None = None
+        self._transition_deadline = 0.0
+        self._lens_targets: dict[str, int] = {}
+        self._lens_moves: dict[str, asyncio.Task] = {}
+        self._notified_data = EMPTY_STATE
+        self._notified_metadata: dict = {}
+        self._notified_success: bool | None = None
+        self._notified_unavailable: set[str] = set()
+        self._invalidated_keys: set[str] = set()
+        self.last_poll_duration = 0.0
         super().__init__(
             hass,
             LOGGER,
@@ -22,28 +106,309 @@ class NecProjectorCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
 
-    async def _async_setup(self):
+    def supports(self, field: str) -> bool:
+        """Return False if the projector is known not to support a field."""
+        return self.capabilities.get(field, True)
+
+    @property
+    def shutter_available(self) -> bool:
+        """Return True unless the projector is known to have no shutter."""
+        return self.supports(FIELD_SHUTTER)
+
+    def field_available(self, field: str) -> bool:
+        """Return True if a field is supported and its last read succeeded."""
+        return self.supports(field) and field not in self.stale_fields
+
+    def _metadata_snapshot(self) -> dict:
+        """Return the metadata values entities depend on."""
+        return {
+            "lens_ranges": dict(self.metadata.lens_ranges),
+            "input_options": self.metadata.input_options,
+        }
+
+    def snapshot(self) -> dict:
+        """Return the last-known state to persist across restarts."""
+        return {
+            "data": self.data.as_dict() if self.data else None,
+            "lens_ranges": self.metadata.lens_ranges,
+            "input_options": self.metadata.input_options,
+            "metadata_model": self.metadata.model_code,
+            "capabilities": self.capabilities,
+            "capabilities_model": self.capabilities_model,
+        }
+
+    @callback
+    def async_restore(self, snapshot: dict) -> None:
+        """Restore a persisted last-known state before the first refresh."""
+        if snapshot["data"] is not None:
+            self.data = NecProjectorState.from_dict(snapshot["data"])
+        self.metadata.lens_ranges = {
+            axis: tuple(lens_range)
+            for axis, lens_range in snapshot["lens_ranges"].items()
+        }
+        self.metadata.input_options = tuple(snapshot["input_options"])
+        self.metadata.model_code = snapshot.get("metadata_model")
+        self.capabilities = snapshot.get("capabilities", {})
+        self.capabilities_model = snapshot.get("capabilities_model")
+        self.api.pipelining = self.supports(CAPABILITY_PIPELINING)
+
+    @callback
+    def async_invalidate_keys(self, *keys: str) -> None:
+        """Notify listeners of these keys on the next update even if unchanged.
+
+        Entities call this after setting an optimistic state, so a device
+        that did not follow the command still corrects them.
+        """
+        self._invalidated_keys.update(keys)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose data keys changed.
+
+        Entities register the keys they depend on as their coordinator
+        context. Listeners without a context, and all listeners when the
+        availability of the projector changes, are always notified.
+        """
+        data = self.data or EMPTY_STATE
+        metadata = self._metadata_snapshot()
+        notify_all = self.last_update_success != self._notified_success
+        changed = data.changed_fields(self._notified_data)
+        changed.update(
+            key for key, value in metadata.items() if value != self._notified_metadata.get(key)
+        )
+        unavailable = {
+            field_key(field) for field in POLLED_FIELDS if not self.field_available(field)
+        }
+        changed |= unavailable ^ self._notified_unavailable
+        changed |= self._invalidated_keys
+        self._invalidated_keys = set()
+        self._notified_unavailable = unavailable
+        self._notified_data = data
+        self._notified_metadata = metadata
+        self._notified_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if notify_all or context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    async def async_power_command_sent(self, power_on: bool) -> None:
+        """Poll the power status quickly until the requested change settles."""
+        self._power_target = power_on
+        self._transition_deadline = time.monotonic() + POWER_TRANSITION_TIMEOUT
+        self._poll_interval = DEFAULT_TRANSITION_SCAN_INTERVAL
+        self.update_interval = timedelta(seconds=DEFAULT_TRANSITION_SCAN_INTERVAL)
+        await self.async_request_refresh()
+
+    def async_move_lens(self, axis: str, position: int) -> None:
+        """Move a lens axis, coalescing rapid changes to the latest target.
+
+        Targets arriving while a move of the same axis is pending replace the
+        queued one, so a slider drag sends only the positions the projector
+        can keep up with. The final position is confirmed with a single read.
+        """
+        self._lens_targets[axis] = position
+        if axis not in self._lens_moves:
+            self._lens_moves[axis] = self.hass.async_create_background_task(
+                self._async_move_lens(axis), f"{DOMAIN} lens move {axis}"
+            )
+
+    async def _async_move_lens(self, axis: str) -> None:
+        """Send the latest target of a lens axis until no new one arrives."""
         try:
-            await self.api.async_get_shutter_status()
-        except ProjectorCommandError:
-            LOGGER.info("Shutter not available, disabling feature")
-            self.shutter_available = False
+            while True:
+                await asyncio.sleep(LENS_SETTLE_DELAY)
+                if (position := self._lens_targets.pop(axis, None)) is not None:
+                    await self.api.async_set_lens_value(axis, position)
+                    continue
+                await asyncio.sleep(LENS_CONFIRM_DELAY)
+                if axis not in self._lens_targets:
+                    break
+            lens_position = await self.api.async_get_lens_position(axis, PRIORITY_USER)
+        except (ProjectorConnectionError, ProjectorCommandError) as err:
+            self._lens_targets.pop(axis, None)
+            LOGGER.error("Error moving lens %s: %s", axis, err)
+            return
+        finally:
+            del self._lens_moves[axis]
+        self.async_merge_data(lens_position)
+        if (position := self._lens_targets.get(axis)) is not None:
+            # A new target arrived during the confirmation read.
+            self.async_move_lens(axis, position)
+
+    @callback
+    def async_merge_data(self, data: dict) -> None:
+        """Merge partial data into the current data without a full poll.
+
+        Unlike async_set_updated_data this keeps the scheduled poll in its
+        fleet slot.
+        """
+        self.data = (self.data or EMPTY_STATE).merge(data)
+        self.async_update_listeners()
+
+    async def _async_read_field(self, field: str) -> dict:
+        """Read a single field from the projector."""
+        if field == FIELD_POWER:
+            return await self.api.async_get_status(PRIORITY_USER)
+        if not self.supports(field):
+            return {}
+        if field == FIELD_SHUTTER:
+            return await self.api.async_get_shutter_status(PRIORITY_USER)
+        if field == FIELD_INPUT:
+            return await self.api.async_get_input_value(PRIORITY_USER)
+        return await self.api.async_get_lens_position(field, PRIORITY_USER)
+
+    async def async_refresh_fields(self, *fields: str) -> None:
+        """Re-read only the fields a command affects and merge them.
+
+        Fields are the power, shutter and input fields or a lens axis. This
+        confirms a command in one round trip per field instead of a full poll.
+        """
+        data = {}
+        for field in fields:
+            try:
+                data |= await self._async_read_field(field)
+            except (ProjectorConnectionError, ProjectorCommandError) as err:
+                LOGGER.debug("Error refreshing %s: %s", field, err)
+        if data:
+            self.async_merge_data(data)
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending lens moves and stop polling."""
+        for task in list(self._lens_moves.values()):
+            task.cancel()
+        await super().async_shutdown()
+
+    def _in_power_transition(self, power_status: dict) -> bool:
+        """Return True while the projector is changing its power state."""
+        if power_status["status"] == ProjectorStatus.COOLING:
+            return True
+        if self._power_target is None:
+            return False
+        if (
+            power_status["power_on"] == self._power_target
+            or time.monotonic() >= self._transition_deadline
+        ):
+            self._power_target = None
+            return False
+        return True
 
     async def _async_update_data(self):
-        """Fetch data from the projector."""
+        """Fetch data from the projector in this coordinator's fleet slot."""
+        async with self.scheduler.async_poll_slot(self):
+            start = time.monotonic()
+            try:
+                return await self._async_poll()
+            except Exception:
+                # A projector that stopped answering must not be polled at the
+                # transition rate past the deadline.
+                if time.monotonic() >= self._transition_deadline:
+                    self._power_target = None
+                    if self._poll_interval == DEFAULT_TRANSITION_SCAN_INTERVAL:
+                        self._poll_interval = DEFAULT_SCAN_INTERVAL
+                raise
+            finally:
+                self.last_poll_duration = time.monotonic() - start
+                if self._poll_interval == DEFAULT_TRANSITION_SCAN_INTERVAL:
+                    interval = self._poll_interval
+                else:
+                    interval = self.scheduler.next_interval(self, self._poll_interval)
+                self.update_interval = timedelta(seconds=interval)
+
+    def _field_query(self, field: str) -> Query:
+        """Return the query of a field, with its metadata if not cached yet."""
+        if field == FIELD_SHUTTER:
+            return SHUTTER_QUERY
+        if field in USAGE_QUERIES:
+            return USAGE_QUERIES[field]
+        if field == FIELD_INPUT:
+            return INPUT_QUERY if self.metadata.input_options else INPUT_OPTIONS_QUERY
+        return lens_query(field, with_range=field not in self.metadata.lens_ranges)
+
+    def _field_values(self, field: str, values: dict) -> dict:
+        """Move the metadata of a field query into the cache."""
+        if "input_options" in values:
+            self.metadata.input_options = values.pop("input_options")
+        elif f"{field}_min" in values:
+            self.metadata.lens_ranges[field] = (
+                values.pop(f"{field}_min"),
+                values.pop(f"{field}_max"),
+            )
+        return values
+
+    async def _async_poll(self):
+        """Query the projector.
+
+        Only the power status is polled while the projector is in standby or
+        changing power state, since nothing else can change meanwhile.
+
+        The fields of a full poll are read in one pipelined batch after the
+        status. Full polls probe which fields a projector model supports: a
+        field is supported once it is read, and unsupported once the projector
+        answers its query with an error reply; unsupported fields are skipped
+        from then on. Any other failure, and any failure of a supported
+        field, only marks the field stale, the rest of the poll goes on.
+        """
         try:
             power_status = await self.api.async_get_status()
-            zoom_status = await self.api.async_get_lens_value("zoom")
-            focus_status = await self.api.async_get_lens_value("focus")
-            h_shift_status = await self.api.async_get_lens_value("h_shift")
-            v_shift_status = await self.api.async_get_lens_value("v_shift")
-            input_values = await self.api.async_get_input_options()
-            
-            if self.shutter_available:
-                shutter_status = await self.api.async_get_shutter_status()
+
+            if self._in_power_transition(power_status):
+                self._fully_polled = False
+                self._poll_interval = DEFAULT_TRANSITION_SCAN_INTERVAL
+                return (self.data or EMPTY_STATE).merge(power_status)
+
+            if (
+                not power_status["power_on"]
+                or power_status["status"] in STANDBY_STATUSES
+            ):
+                self._fully_polled = False
+                self._poll_interval = DEFAULT_STANDBY_SCAN_INTERVAL
+                return (self.data or EMPTY_STATE).merge(power_status)
+
+            if not self._fully_polled:
+                self._power_session += 1
+                self._fully_polled = True
+            model_code = power_status["model_code"]
+            self.metadata.validate(
+                (self._power_session, self.api.session_resets), model_code
+            )
+            self._poll_interval = DEFAULT_SCAN_INTERVAL
+
+            if self.capabilities_model != model_code:
+                self.capabilities = {
+                    key: value
+                    for key, value in self.capabilities.items()
+                    if key not in POLLED_FIELDS and key != CAPABILITY_PIPELINING
+                }
+                self.capabilities_model = model_code
+                self.api.pipelining = True
+
+            data = dict(power_status)
+            stale_fields = set()
+            fields = [field for field in POLLED_FIELDS if self.supports(field)]
+            if fields:
+                results = await self.api.async_query_batch(
+                    [self._field_query(field) for field in fields]
+                )
+                if not self.api.pipelining:
+                    self.capabilities[CAPABILITY_PIPELINING] = False
             else:
-                shutter_status = {"shutter_status": "disabled"}
+                results = []
+            for field, result in zip(fields, results):
+                probing = field not in self.capabilities
+                if result.error is None:
+                    data |= self._field_values(field, result.value)
+                    if probing:
+                        self.capabilities[field] = True
+                elif probing and isinstance(result.error, ProjectorRejectedError):
+                    LOGGER.info("%s not supported by the projector: %s", field, result.error)
+                    self.capabilities[field] = False
+                else:
+                    LOGGER.debug(
+                        "Error reading %s, keeping last value: %s", field, result.error
+                    )
+                    stale_fields.add(field)
+            self.stale_fields = stale_fields
 
-            return power_status | shutter_status | zoom_status | focus_status | h_shift_status | v_shift_status | input_values
+            return (self.data or EMPTY_STATE).merge(data)
         except (ProjectorConnectionError, ProjectorCommandError) as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
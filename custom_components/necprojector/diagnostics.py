@@ -0,0 +1,57 @@
+"""Diagnostics support for NEC Projector."""
+
+import base64
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_MEMBERS
+from .coordinator import NecProjectorCoordinator
+from .group import NecProjectorGroup
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    if CONF_MEMBERS in entry.data:
+        group: NecProjectorGroup = hass.data[entry.entry_id]
+        return {
+            "entry": dict(entry.data),
+            "members_set_up": list(group.coordinators),
+            "last_command": group.last_report,
+        }
+    coordinator: NecProjectorCoordinator = hass.data[entry.entry_id]
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "data": coordinator.data.as_dict() if coordinator.data else None,
+        "metadata": {
+            "lens_ranges": coordinator.metadata.lens_ranges,
+            "input_options": coordinator.metadata.input_options,
+        },
+        "capabilities": {
+            "model_code": coordinator.capabilities_model,
+            "supported": coordinator.capabilities,
+            "stale_fields": sorted(coordinator.stale_fields),
+        },
+        "poll": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "last_duration": round(coordinator.last_poll_duration, 3),
+            "lag": round(coordinator.scheduler.lag(coordinator), 3),
+        },
+        "api": coordinator.api.stats.as_dict(),
+        "circuit": coordinator.api.circuit.as_dict(),
+        "reply_timeouts": coordinator.api.reply_timeouts,
+        "fleet": coordinator.scheduler.stats,
+        # Binary protocol trace, decode with python -m tools.replay
+        "trace": base64.b64encode(coordinator.api.trace.export()).decode()
+        if coordinator.api.trace is not None
+        else None,
+    }
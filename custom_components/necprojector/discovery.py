@@ -0,0 +1,71 @@
+"""Network discovery of NEC projectors."""
+
+import asyncio
+import ipaddress
+from typing import NamedTuple
+
+from .api import NecProjectorApi, ProjectorCommandError, ProjectorConnectionError
+from .const import (
+    DEFAULT_PORT,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_MAX_CONCURRENT,
+    DISCOVERY_TIMEOUT,
+    LOGGER,
+)
+
+
+class DiscoveredProjector(NamedTuple):
+    """A projector that answered the status query."""
+
+    host: str
+    model_code: int
+
+
+def network_hosts(network: str) -> list[str]:
+    """Return the host addresses of a network given in CIDR notation.
+
+    Raises ValueError if the network is not valid.
+    """
+    return [
+        str(address)
+        for address in ipaddress.ip_network(network.strip(), strict=False).hosts()
+    ]
+
+
+async def _async_probe(host: str, port: int) -> DiscoveredProjector | None:
+    """Return the projector at a host, or None if nothing answers as one."""
+    api = NecProjectorApi(
+        host,
+        port,
+        timeout=DISCOVERY_TIMEOUT,
+        connect_timeout=DISCOVERY_CONNECT_TIMEOUT,
+    )
+    try:
+        status = await api.async_get_status()
+    except (ProjectorConnectionError, ProjectorCommandError):
+        return None
+    finally:
+        await api.async_close()
+    return DiscoveredProjector(host, status["model_code"])
+
+
+async def async_discover(
+    hosts: list[str],
+    port: int = DEFAULT_PORT,
+    max_concurrent: int = DISCOVERY_MAX_CONCURRENT,
+) -> list[DiscoveredProjector]:
+    """Probe hosts concurrently and return the projectors found.
+
+    Each host gets a short connect timeout, and only hosts that answer the
+    binary status query with a valid reply are reported.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def _async_probe_bounded(host: str) -> DiscoveredProjector | None:
+        async with semaphore:
+            return await _async_probe(host, port)
+
+    results = await asyncio.gather(*(_async_probe_bounded(host) for host in hosts))
+    found = [projector for projector in results if projector is not None]
+    LOGGER.debug("Discovery probed %s hosts, found %s projectors", len(hosts), len(found))
+    return found
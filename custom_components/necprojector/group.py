@@ -0,0 +1,225 @@
+"""Groups of NEC projectors driven together.
+
+A group config entry lists the config entries of its member projectors.
+Commands to a group are released to every member at the same moment, after
+each member has taken and warmed up its session, so that the projectors of
+an edge-blended wall change in step.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo, Entity
+
+from .api import ProjectorCommandError, ProjectorConnectionError
+from .const import CONF_MEMBERS, DOMAIN, GROUP_READY_TIMEOUT, LOGGER
+from .coordinator import NecProjectorCoordinator
+
+
+class NecProjectorGroup:
+    """Projectors of several config entries controlled as one."""
+
+    def __init__(self, hass: HomeAssistant, member_ids: Iterable[str]) -> None:
+        """Initialize the group."""
+        self.hass = hass
+        self.member_ids = tuple(member_ids)
+        self.last_report: dict | None = None
+
+    @property
+    def coordinators(self) -> dict[str, NecProjectorCoordinator]:
+        """Return the coordinators of the members that are set up."""
+        return {
+            entry_id: self.hass.data[entry_id]
+            for entry_id in self.member_ids
+            if entry_id in self.hass.data
+        }
+
+    @property
+    def pending_members(self) -> list[str]:
+        """Return the members that exist but are not set up yet."""
+        return [
+            entry_id
+            for entry_id in self.member_ids
+            if entry_id not in self.hass.data
+            and self.hass.config_entries.async_get_entry(entry_id) is not None
+        ]
+
+    def members_supporting(self, field: str) -> list[str]:
+        """Return the set-up members not known to lack a field."""
+        return [
+            entry_id
+            for entry_id, coordinator in self.coordinators.items()
+            if coordinator.supports(field)
+        ]
+
+    def _member_name(self, entry_id: str) -> str:
+        """Return the title of a member entry."""
+        entry = self.hass.config_entries.async_get_entry(entry_id)
+        return entry.title if entry is not None else entry_id
+
+    async def async_send(
+        self, command: bytes, members: Iterable[str] | None = None
+    ) -> list[NecProjectorCoordinator]:
+        """Send a command to all members, or to some of them, at once.
+
+        Every member first takes its session and warms it up. The command is
+        released to all of them once they are ready, or after
+        GROUP_READY_TIMEOUT for members that are late. Returns the
+        coordinators of the members that acknowledged the command, and
+        raises the first error if none did.
+        """
+        coordinators = self.coordinators
+        if members is not None:
+            coordinators = {
+                entry_id: coordinators[entry_id]
+                for entry_id in members
+                if entry_id in coordinators
+            }
+        if not coordinators:
+            raise ProjectorConnectionError("No projector of the group is available")
+
+        loop = asyncio.get_running_loop()
+        release = asyncio.Event()
+        tasks = []
+        ready = []
+        for coordinator in coordinators.values():
+            member_ready = loop.create_future()
+            task = asyncio.ensure_future(
+                coordinator.api.async_send_synchronized(
+                    command,
+                    lambda future=member_ready: future.done() or future.set_result(None),
+                    release,
+                )
+            )
+            # A member that fails before it is ready must not hold up the others.
+            task.add_done_callback(
+                lambda _, future=member_ready: future.done() or future.set_result(None)
+            )
+            tasks.append(task)
+            ready.append(member_ready)
+        try:
+            await asyncio.wait(ready, timeout=GROUP_READY_TIMEOUT)
+        finally:
+            release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        report = self._report(coordinators, results)
+        self.last_report = report
+        LOGGER.debug("Group command %r landed with a skew of %s ms", command, report["skew_ms"])
+
+        acknowledged = []
+        errors = []
+        for (entry_id, coordinator), result in zip(coordinators.items(), results):
+            if isinstance(result, (ProjectorConnectionError, ProjectorCommandError)):
+                LOGGER.warning(
+                    "Group command failed on %s: %s", self._member_name(entry_id), result
+                )
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                acknowledged.append(coordinator)
+        if not acknowledged:
+            raise errors[0]
+        return acknowledged
+
+    def _report(
+        self, coordinators: dict[str, NecProjectorCoordinator], results: list
+    ) -> dict:
+        """Return how far apart the command was written and landed on each member."""
+        timings = [result for result in results if isinstance(result, tuple)]
+        first_written = min((written for written, _ in timings), default=0.0)
+        first_landed = min((landed for _, landed in timings), default=0.0)
+        members = {}
+        for entry_id, result in zip(coordinators, results):
+            if isinstance(result, tuple):
+                written, landed = result
+                members[self._member_name(entry_id)] = {
+                    "written_ms": round((written - first_written) * 1000, 2),
+                    "landed_ms": round((landed - first_landed) * 1000, 2),
+                }
+            else:
+                members[self._member_name(entry_id)] = {"error": str(result)}
+        return {
+            "members": members,
+            "write_skew_ms": round(
+                (max(written for written, _ in timings) - first_written) * 1000, 2
+            )
+            if timings
+            else None,
+            "skew_ms": round((max(landed for _, landed in timings) - first_landed) * 1000, 2)
+            if timings
+            else None,
+        }
+
+
+class NecProjectorGroupEntity(Entity, ABC):
+    """Base of the entities of a projector group.
+
+    The state is aggregated from the coordinators of the members, listening
+    only to the data keys the entity depends on.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(
+        self, group: NecProjectorGroup, entry: ConfigEntry, keys: tuple[str, ...]
+    ) -> None:
+        """Initialize the entity."""
+        self.group = group
+        self._entry = entry
+        self._keys = keys
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry.unique_id)}, name=self._entry.title
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True if at least one member is reachable."""
+        return any(
+            coordinator.last_update_success
+            for coordinator in self.group.coordinators.values()
+        )
+
+    def member_values(self, key: str) -> list:
+        """Return a data key of every member with data."""
+        return [
+            getattr(coordinator.data, key)
+            for coordinator in self.group.coordinators.values()
+            if coordinator.data
+        ]
+
+    @abstractmethod
+    def _update_from_members(self) -> None:
+        """Aggregate the state of the members."""
+
+    def _update_from_command(self) -> None:
+        """Expose the timing of the last group command."""
+        report = self.group.last_report
+        self._attr_extra_state_attributes = {
+            CONF_MEMBERS: len(self.group.member_ids),
+            "command_skew_ms": report["skew_ms"] if report else None,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the members' coordinators."""
+        await super().async_added_to_hass()
+        for coordinator in self.group.coordinators.values():
+            self.async_on_remove(
+                coordinator.async_add_listener(self._handle_member_update, self._keys)
+            )
+        self._update_from_members()
+        self._update_from_command()
+
+    @callback
+    def _handle_member_update(self) -> None:
+        """Handle updated data from a member."""
+        self._update_from_members()
+        self.async_write_ha_state()
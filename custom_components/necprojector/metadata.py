@@ -0,0 +1,36 @@
+"""Static projector metadata cache for the NEC Projector integration."""
+
+from collections.abc import Hashable
+
+
+class NecProjectorMetadata:
+    """Lens ranges and input options of one projector.
+
+    These are fixed hardware facts, so they are read once per power-on
+    session and reused by every poll until the session key changes.
+    Metadata restored from storage belongs to no session yet; the first
+    session of the same model adopts it instead of reading it again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self.lens_ranges: dict[str, tuple[int, int]] = {}
+        self.input_options: tuple[str, ...] = ()
+        self.model_code: int | None = None
+        self._session_key: Hashable = None
+
+    def validate(self, session_key: Hashable, model_code: int | None) -> None:
+        """Drop the cached metadata if it belongs to another session."""
+        if session_key == self._session_key:
+            return
+        if self._session_key is not None or model_code != self.model_code:
+            self.clear()
+        self._session_key = session_key
+        self.model_code = model_code
+
+    def clear(self) -> None:
+        """Forget all cached metadata."""
+        self.lens_ranges = {}
+        self.input_options = ()
+        self.model_code = None
+        self._session_key = None
@@ -7,7 +7,7 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN, LENS_AXES, LOGGER
 from .coordinator import NecProjectorCoordinator
 
 
@@ -17,13 +17,12 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the NEC Projector number entities."""
-    lens_properties = ["zoom", "focus", "h_shift", "v_shift"]
-
+    coordinator = hass.data[entry.entry_id]
     lens_numbers = [NecProjectorLensNumber(
-            coordinator=hass.data[entry.entry_id], entry=entry, lens_property=p
-        ) for p in lens_properties
+            coordinator=coordinator, entry=entry, lens_property=p
+        ) for p in LENS_AXES if coordinator.supports(p)
     ]
-    async_add_entities(lens_numbers, update_before_add=True)
+    async_add_entities(lens_numbers)
 
 
 class NecProjectorLensNumber(CoordinatorEntity, NumberEntity):
@@ -33,7 +32,8 @@ class NecProjectorLensNumber(CoordinatorEntity, NumberEntity):
         self, coordinator: NecProjectorCoordinator, entry: ConfigEntry, lens_property: str
     ) -> None:
         """Initialize the number."""
-        super().__init__(coordinator)
+        self._value_key = f"{lens_property}_value"
+        super().__init__(coordinator, context=(self._value_key, "lens_ranges"))
         self.lens_property = lens_property
         self._entry = entry
         self._attr_native_step = 1
@@ -48,55 +48,41 @@ class NecProjectorLensNumber(CoordinatorEntity, NumberEntity):
             identifiers={(DOMAIN, self._entry.unique_id)}, name=self._entry.title
         )
 
+    @property
+    def available(self) -> bool:
+        """Return True if the lens position can be read from the projector."""
+        return super().available and self.coordinator.field_available(self.lens_property)
+
+    def _update_lens_range(self) -> None:
+        """Apply the cached lens range of this axis."""
+        lens_range = self.coordinator.metadata.lens_ranges.get(self.lens_property)
+        if lens_range:
+            self._attr_native_min_value, self._attr_native_max_value = lens_range
+
+    def _update_native_value(self) -> None:
+        """Apply the last position read from the projector."""
+        value = getattr(self.coordinator.data, self._value_key, None)
+        if value is not None:
+            self._attr_native_value = value
+        else:
+            LOGGER.debug("%s is not available", self._value_key)
+
     @callback
     def _handle_coordinator_update(self) -> None:
-        value_property = f"{self.lens_property}_value"
-        if self.coordinator.data and self.coordinator.data.get(value_property):
-            try:
-                self._attr_native_value = float(self.coordinator.data.get(value_property))
-            except ValueError as ex:
-                LOGGER.error(
-                    "ValueError for %s, %s",
-                    value_property,
-                    ex
-                )
-            except TypeError as ex:
-                LOGGER.error("TypeError for %s, %s", value_property, ex)
-        else:
-            LOGGER.debug(f"{value_property} is not available")
-    
+        self._update_lens_range()
+        self._update_native_value()
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        value_property = f"{self.lens_property}_value"
-        max_property = f"{self.lens_property}_max"
-        min_property = f"{self.lens_property}_min"
-
-        if self.coordinator.data and self.coordinator.data.get(value_property):
-            try:
-                self._attr_native_value = float(self.coordinator.data.get(value_property))
-                self._attr_native_max_value = float(
-                    self.coordinator.data.get(max_property)
-                )
-                self._attr_native_min_value = float(
-                    self.coordinator.data.get(min_property)
-                )
-            except ValueError as ex:
-                LOGGER.error(
-                    "ValueError for %s, %s",
-                    value_property,
-                    ex
-                )
-            except TypeError as ex:
-                LOGGER.error("TypeError for %s, %s", value_property, ex)
-        else:
-            LOGGER.debug(f"{value_property} is not available")
+        self._update_lens_range()
+        self._update_native_value()
 
     async def async_set_native_value(self, value: float) -> None:
         """Turn the switch on."""
-        if self.coordinator.data.get("power_on"):
+        if self.coordinator.data.power_on:
             lens_value = int(value)
-            await self.coordinator.api.async_set_lens_value(self.lens_property, lens_value)
+            self.coordinator.async_move_lens(self.lens_property, lens_value)
             self._attr_native_value = lens_value
+            self.coordinator.async_invalidate_keys(self._value_key)
             self.async_write_ha_state()
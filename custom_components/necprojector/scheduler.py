@@ -0,0 +1,96 @@
+"""Fleet poll scheduler for the NEC Projector integration."""
+
+import asyncio
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+
+from .const import DEFAULT_MAX_CONCURRENT_POLLS, POLL_JITTER
+
+
+class NecProjectorPollScheduler:
+    """Spreads the polls of all projectors evenly across their interval.
+
+    Every registered coordinator gets its own phase within the poll interval,
+    so polls do not line up after a restart, and at most a fixed number of
+    projectors are polled at the same time.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_POLLS) -> None:
+        """Initialize the scheduler."""
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._members: list[Hashable] = []
+        self._phases: dict[Hashable, float] = {}
+        self._due: dict[Hashable, float] = {}
+        self._lags: dict[Hashable, float] = {}
+        self._in_flight = 0
+
+    def register(self, member: Hashable) -> None:
+        """Add a coordinator to the fleet."""
+        if member not in self._phases:
+            self._members.append(member)
+            self._rebalance()
+
+    def unregister(self, member: Hashable) -> None:
+        """Remove a coordinator from the fleet."""
+        if member in self._phases:
+            self._members.remove(member)
+            for values in (self._phases, self._due, self._lags):
+                values.pop(member, None)
+            self._rebalance()
+
+    def _rebalance(self) -> None:
+        """Give every member an evenly spaced, slightly jittered phase."""
+        count = len(self._members)
+        for index, member in enumerate(self._members):
+            self._phases[member] = (index + random.uniform(0, POLL_JITTER)) / count
+
+    def next_interval(self, member: Hashable, interval: float) -> float:
+        """Return the delay until the next poll slot of a member.
+
+        The slot is the next point in time matching the member's phase that
+        is at least half an interval away, which keeps the average period at
+        the requested interval.
+        """
+        if member not in self._phases:
+            return interval
+        offset = self._phases[member] * interval
+        now = time.time()
+        due = (math.floor((now - offset) / interval) + 1) * interval + offset
+        if due - now < interval / 2:
+            due += interval
+        self._due[member] = due
+        return due - now
+
+    def startup_delay(self, member: Hashable, window: float) -> float:
+        """Return when a member should first refresh within a startup window."""
+        return self._phases.get(member, 0.0) * window
+
+    @asynccontextmanager
+    async def async_poll_slot(self, member: Hashable) -> AsyncIterator[None]:
+        """Wait for a free poll slot and record how late the poll started."""
+        async with self._semaphore:
+            if (due := self._due.pop(member, None)) is not None:
+                self._lags[member] = max(0.0, time.time() - due)
+            self._in_flight += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+
+    def lag(self, member: Hashable) -> float:
+        """Return how late the last poll of a member started, in seconds."""
+        return self._lags.get(member, 0.0)
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """Return how far behind schedule the fleet is polling."""
+        lags = list(self._lags.values())
+        return {
+            "projectors": len(self._members),
+            "polls_in_flight": self._in_flight,
+            "max_lag": max(lags, default=0.0),
+            "mean_lag": sum(lags) / len(lags) if lags else 0.0,
+        }
@@ -1,5 +1,7 @@
 """Select platform for NEC Projector."""
 
+import asyncio
+
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
@@ -7,8 +9,10 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER
+from . import codec
+from .const import DOMAIN, FIELD_INPUT, LOGGER
 from .coordinator import NecProjectorCoordinator
+from .group import NecProjectorGroup, NecProjectorGroupEntity
 
 
 async def async_setup_entry(
@@ -17,11 +21,18 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the NEC Projector select entities."""
+    if isinstance(hass.data[entry.entry_id], NecProjectorGroup):
+        group = hass.data[entry.entry_id]
+        if group.members_supporting(FIELD_INPUT):
+            async_add_entities([NecProjectorGroupSelectInput(group, entry)])
+        return
+    if not hass.data[entry.entry_id].supports(FIELD_INPUT):
+        return
     select_input = NecProjectorSelectInput(
         coordinator=hass.data[entry.entry_id], entry=entry
     )
     
-    async_add_entities([select_input], update_before_add=True)
+    async_add_entities([select_input])
 
 
 class NecProjectorSelectInput(CoordinatorEntity, SelectEntity):
@@ -31,13 +42,12 @@ class NecProjectorSelectInput(CoordinatorEntity, SelectEntity):
         self, coordinator: NecProjectorCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the select."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("input_value", "input_options"))
         self._entry = entry
         self._attr_unique_id = f"{entry.unique_id}_input"
         self._attr_name = f"{entry.title} Input"
         self._attr_has_entity_name = True
-        self._attr_available = True
-        self._attr_options = coordinator.data.get("input_options", [])
+        self._attr_options = list(coordinator.metadata.input_options)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -46,23 +56,90 @@ class NecProjectorSelectInput(CoordinatorEntity, SelectEntity):
             identifiers={(DOMAIN, self._entry.unique_id)}, name=self._entry.title
         )
 
+    @property
+    def available(self) -> bool:
+        """Return True if the input can be read from the projector."""
+        return super().available and self.coordinator.field_available(FIELD_INPUT)
+
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
        
-        if self.coordinator.data and self.coordinator.data.get("input_value"):
-            self._attr_current_option = self.coordinator.data.get("input_value")
+        if self.coordinator.data and self.coordinator.data.input_value:
+            self._attr_current_option = self.coordinator.data.input_value
         
         self.async_write_ha_state()
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        if self.coordinator.data and self.coordinator.data.get("input_value"):
-            self._attr_current_option = self.coordinator.data.get("input_value")
+        if self.coordinator.metadata.input_options:
+            self._attr_options = list(self.coordinator.metadata.input_options)
+        if self.coordinator.data and self.coordinator.data.input_value:
+            self._attr_current_option = self.coordinator.data.input_value
         
         self.async_write_ha_state()
     
     async def async_select_option(self, option: str) -> None:
-        if self.coordinator.data.get("power_on"):
+        if self.coordinator.data.power_on:
             await self.coordinator.api.async_set_input_option(option)
             self._attr_current_option = option
+            self.coordinator.async_invalidate_keys("input_value")
             self.async_write_ha_state()
+            await self.coordinator.async_refresh_fields(FIELD_INPUT)
+
+
+class NecProjectorGroupSelectInput(NecProjectorGroupEntity, SelectEntity):
+    """Video input of a group of NEC projectors.
+
+    The options are the inputs every member offers, and the current option
+    is only known while all members show the same input.
+    """
+
+    def __init__(self, group: NecProjectorGroup, entry: ConfigEntry) -> None:
+        """Initialize the select."""
+        super().__init__(group, entry, ("input_value", "input_options"))
+        self._attr_unique_id = f"{entry.unique_id}_input"
+        self._attr_name = f"{entry.title} Input"
+        self._attr_options = []
+
+    def _update_from_members(self) -> None:
+        members = self.group.coordinators
+        coordinators = [
+            members[entry_id] for entry_id in self.group.members_supporting(FIELD_INPUT)
+        ]
+        option_lists = [
+            coordinator.metadata.input_options
+            for coordinator in coordinators
+            if coordinator.metadata.input_options
+        ]
+        if option_lists:
+            self._attr_options = [
+                option
+                for option in option_lists[0]
+                if all(option in options for options in option_lists[1:])
+            ]
+        values = {
+            coordinator.data.input_value
+            for coordinator in coordinators
+            if coordinator.data and coordinator.data.input_value
+        }
+        self._attr_current_option = values.pop() if len(values) == 1 else None
+
+    async def async_select_option(self, option: str) -> None:
+        coordinators = self.group.coordinators
+        members = [
+            entry_id
+            for entry_id in self.group.members_supporting(FIELD_INPUT)
+            if (data := coordinators[entry_id].data) and data.power_on
+        ]
+        if not members:
+            LOGGER.warning("No projector of %s is powered on", self._entry.title)
+            return
+        coordinators = await self.group.async_send(codec.input_set(option), members)
+        self._attr_current_option = option
+        self._update_from_command()
+        for coordinator in coordinators:
+            coordinator.async_invalidate_keys("input_value")
+        self.async_write_ha_state()
+        await asyncio.gather(
+            *(coordinator.async_refresh_fields(FIELD_INPUT) for coordinator in coordinators)
+        )
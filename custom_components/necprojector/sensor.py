@@ -1,13 +1,21 @@
 """Sensor platform for NEC Projector."""
 
-from homeassistant.components.sensor import SensorEntity
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN, FIELD_FILTER, FIELD_LAMP, LOGGER
 from .coordinator import NecProjectorCoordinator
 
 
@@ -17,11 +25,99 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the NEC Projector sensor entities."""
+    coordinator = hass.data[entry.entry_id]
     status_sensor = NecProjectorStatusSensor(
         coordinator=hass.data[entry.entry_id], entry=entry
     )
+    usage_sensors = [
+        NecProjectorUsageSensor(
+            coordinator=coordinator, entry=entry, description=description
+        )
+        for description in USAGE_SENSORS
+        if coordinator.supports(description.field)
+    ]
+    diagnostic_sensors = [
+        NecProjectorDiagnosticSensor(
+            coordinator=hass.data[entry.entry_id], entry=entry, description=description
+        )
+        for description in DIAGNOSTIC_SENSORS
+    ]
     
-    async_add_entities([status_sensor], update_before_add=True)
+    async_add_entities([status_sensor, *usage_sensors, *diagnostic_sensors])
+
+
+@dataclass(frozen=True, kw_only=True)
+class NecProjectorDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a NEC Projector performance sensor."""
+
+    value_fn: Callable[[NecProjectorCoordinator], float | int]
+
+
+@dataclass(frozen=True, kw_only=True)
+class NecProjectorUsageSensorEntityDescription(SensorEntityDescription):
+    """Describes a NEC Projector usage counter."""
+
+    field: str
+
+
+USAGE_SENSORS = (
+    NecProjectorUsageSensorEntityDescription(
+        key="lamp_usage",
+        name="Lamp usage",
+        field=FIELD_LAMP,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    NecProjectorUsageSensorEntityDescription(
+        key="filter_usage",
+        name="Filter usage",
+        field=FIELD_FILTER,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+)
+
+DIAGNOSTIC_SENSORS = (
+    NecProjectorDiagnosticSensorEntityDescription(
+        key="poll_duration",
+        name="Poll duration",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: round(coordinator.last_poll_duration * 1000, 1),
+    ),
+    NecProjectorDiagnosticSensorEntityDescription(
+        key="poll_lag",
+        name="Poll lag",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: round(coordinator.scheduler.lag(coordinator), 3),
+    ),
+    NecProjectorDiagnosticSensorEntityDescription(
+        key="command_latency",
+        name="Command latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: round(coordinator.api.stats.mean_latency, 1),
+    ),
+    NecProjectorDiagnosticSensorEntityDescription(
+        key="timeouts",
+        name="Timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.api.stats.timeouts,
+    ),
+    NecProjectorDiagnosticSensorEntityDescription(
+        key="sockets_opened",
+        name="Sockets opened",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.api.stats.sockets_opened,
+    ),
+    NecProjectorDiagnosticSensorEntityDescription(
+        key="parse_failures",
+        name="Parse failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.api.stats.parse_failures,
+    ),
+)
 
 
 class NecProjectorStatusSensor(CoordinatorEntity, SensorEntity):
@@ -31,7 +127,7 @@ class NecProjectorStatusSensor(CoordinatorEntity, SensorEntity):
         self, coordinator: NecProjectorCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("status",))
         self._entry = entry
         self._attr_unique_id = f"{entry.unique_id}_status"
         self._attr_name = f"{entry.title} Status"
@@ -47,14 +143,90 @@ class NecProjectorStatusSensor(CoordinatorEntity, SensorEntity):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        if self.coordinator.data and self.coordinator.data.get("status"):
-            self._attr_native_value = self.coordinator.data.get("status")
+        if self.coordinator.data and self.coordinator.data.status:
+            self._attr_native_value = self.coordinator.data.status
         
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        if self.coordinator.data and self.coordinator.data.get("status"):
-            self._attr_native_value = self.coordinator.data.get("status")
+        if self.coordinator.data and self.coordinator.data.status:
+            self._attr_native_value = self.coordinator.data.status
         
         self.async_write_ha_state()
+
+
+class NecProjectorUsageSensor(CoordinatorEntity, SensorEntity):
+    """Lamp or filter usage time of a NEC Projector."""
+
+    entity_description: NecProjectorUsageSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: NecProjectorCoordinator,
+        entry: ConfigEntry,
+        description: NecProjectorUsageSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, context=(description.key,))
+        self.entity_description = description
+        self._entry = entry
+        self._attr_unique_id = f"{entry.unique_id}_{description.key}"
+        self._attr_name = f"{entry.title} {description.name}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry.unique_id)}, name=self._entry.title
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True if the counter can be read from the projector."""
+        return super().available and self.coordinator.field_available(
+            self.entity_description.field
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the last usage time read from the projector."""
+        if self.coordinator.data:
+            return getattr(self.coordinator.data, self.entity_description.key)
+        return None
+
+
+class NecProjectorDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Performance counter of a NEC Projector, disabled by default."""
+
+    entity_description: NecProjectorDiagnosticSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: NecProjectorCoordinator,
+        entry: ConfigEntry,
+        description: NecProjectorDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._entry = entry
+        self._attr_unique_id = f"{entry.unique_id}_{description.key}"
+        self._attr_name = f"{entry.title} {description.name}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry.unique_id)}, name=self._entry.title
+        )
+
+    @property
+    def native_value(self) -> float | int:
+        """Return the current value of the counter."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,68 @@
+"""Typed state snapshot of a NEC projector."""
+
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .const import LENS_AXES, ProjectorStatus
+
+
+@dataclass(frozen=True, slots=True)
+class NecProjectorState:
+    """Immutable snapshot of the values last read from one projector.
+
+    Field names match the keys entities register as their coordinator
+    context, so the fields that differ between two snapshots are exactly the
+    keys whose listeners need an update.
+    """
+
+    power_on: bool | None = None
+    status: ProjectorStatus | None = None
+    model_code: int | None = None
+    zoom_value: int | None = None
+    focus_value: int | None = None
+    h_shift_value: int | None = None
+    v_shift_value: int | None = None
+    input_value: str | None = None
+    shutter_status: str | None = None
+    lamp_usage: float | None = None
+    filter_usage: float | None = None
+
+    def merge(self, values: dict[str, Any]) -> "NecProjectorState":
+        """Return a copy with some fields replaced, or self if none changed."""
+        for name, value in values.items():
+            if getattr(self, name) != value:
+                return replace(self, **values)
+        return self
+
+    def changed_fields(self, other: "NecProjectorState") -> set[str]:
+        """Return the names of the fields that differ from another snapshot."""
+        if other is self:
+            return set()
+        return {
+            name
+            for name in self.__slots__
+            if getattr(self, name) != getattr(other, name)
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields as a serializable dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "NecProjectorState":
+        """Build a snapshot from persisted values, ignoring unknown keys."""
+        values = {
+            name: data[name] for name in cls.__slots__ if data.get(name) is not None
+        }
+        if "status" in values:
+            try:
+                values["status"] = ProjectorStatus(values["status"])
+            except ValueError:
+                values["status"] = ProjectorStatus.INVALID
+        for axis in LENS_AXES:
+            if (key := f"{axis}_value") in values:
+                values[key] = int(values[key])
+        return cls(**values)
+
+
+EMPTY_STATE = NecProjectorState()
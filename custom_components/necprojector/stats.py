@@ -0,0 +1,93 @@
+"""Performance counters for the NEC Projector integration."""
+
+from bisect import bisect_left
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("buckets", "count", "maximum", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record a latency in seconds."""
+        latency_ms = latency * 1000
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total += latency_ms
+        self.maximum = max(self.maximum, latency_ms)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean latency in milliseconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict:
+        """Return the histogram as a serializable dict."""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean, 2),
+            "max_ms": round(self.maximum, 2),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class NecProjectorApiStats:
+    """Counters of the traffic with one projector."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.latency: dict[str, LatencyHistogram] = {}
+        self.connect_timeouts = 0
+        self.read_timeouts = 0
+        self.retries = 0
+        self.sockets_opened = 0
+        self.parse_failures = 0
+        self.circuit_opens = 0
+        self.fast_failures = 0
+
+    def record_latency(self, command_type: str, latency: float) -> None:
+        """Record the round trip time of one command."""
+        if (histogram := self.latency.get(command_type)) is None:
+            histogram = self.latency[command_type] = LatencyHistogram()
+        histogram.record(latency)
+
+    @property
+    def mean_latency(self) -> float:
+        """Return the mean round trip time of all commands in milliseconds."""
+        count = sum(histogram.count for histogram in self.latency.values())
+        total = sum(histogram.total for histogram in self.latency.values())
+        return total / count if count else 0.0
+
+    @property
+    def timeouts(self) -> int:
+        """Return the number of connect and read timeouts."""
+        return self.connect_timeouts + self.read_timeouts
+
+    def as_dict(self) -> dict:
+        """Return the counters as a serializable dict."""
+        return {
+            "latency": {
+                command_type: histogram.as_dict()
+                for command_type, histogram in self.latency.items()
+            },
+            "connect_timeouts": self.connect_timeouts,
+            "read_timeouts": self.read_timeouts,
+            "retries": self.retries,
+            "sockets_opened": self.sockets_opened,
+            "parse_failures": self.parse_failures,
+            "circuit_opens": self.circuit_opens,
+            "fast_failures": self.fast_failures,
+        }
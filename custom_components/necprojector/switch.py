@@ -9,8 +9,10 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .codec import CMD_POWER_OFF, CMD_POWER_ON, CMD_SHUTTER_CLOSE, CMD_SHUTTER_OPEN
+from .const import DOMAIN, FIELD_SHUTTER
 from .coordinator import NecProjectorCoordinator
+from .group import NecProjectorGroup, NecProjectorGroupEntity
 
 
 async def async_setup_entry(
@@ -19,17 +21,24 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the NEC Projector switch."""
+    if isinstance(hass.data[entry.entry_id], NecProjectorGroup):
+        group = hass.data[entry.entry_id]
+        group_switches = [NecProjectorGroupPowerSwitch(group, entry)]
+        if group.members_supporting(FIELD_SHUTTER):
+            group_switches.append(NecProjectorGroupShutterSwitch(group, entry))
+        async_add_entities(group_switches)
+        return
     switches = [
         NecProjectorPowerSwitch(
             coordinator=hass.data[entry.entry_id], entry=entry
         )
     ]
-    if hass.data[entry.entry_id].data.get("shutter_status") != "disabled":
+    if hass.data[entry.entry_id].shutter_available:
         shutter_switch = NecProjectorShutterSwitch(
             coordinator=hass.data[entry.entry_id], entry=entry
         )
         switches.append(shutter_switch)
-    async_add_entities(switches, update_before_add=True)
+    async_add_entities(switches)
 
 
 class NecProjectorPowerSwitch(CoordinatorEntity, SwitchEntity):
@@ -39,7 +48,7 @@ class NecProjectorPowerSwitch(CoordinatorEntity, SwitchEntity):
         self, coordinator: NecProjectorCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("power_on",))
         self._entry = entry
         self._attr_unique_id = f"{entry.unique_id}_power"
         self._attr_name = f"{entry.title} Power"
@@ -54,14 +63,14 @@ class NecProjectorPowerSwitch(CoordinatorEntity, SwitchEntity):
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
         if self.coordinator.data:
-            self._attr_is_on = self.coordinator.data.get("power_on", False)
+            self._attr_is_on = bool(self.coordinator.data.power_on)
     
         self.async_write_ha_state()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         if self.coordinator.data:
-            self._attr_is_on = self.coordinator.data.get("power_on", False)
+            self._attr_is_on = bool(self.coordinator.data.power_on)
     
         self.async_write_ha_state()
 
@@ -69,13 +78,18 @@ class NecProjectorPowerSwitch(CoordinatorEntity, SwitchEntity):
         """Turn the switch on."""
         await self.coordinator.api.async_power_on()
         self._attr_is_on = True
+        self.coordinator.async_invalidate_keys("power_on")
         self.async_write_ha_state()
+        await self.coordinator.async_power_command_sent(True)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
         await self.coordinator.api.async_power_off()
         self._attr_is_on = False
+        self.coordinator.async_invalidate_keys("power_on")
         self.async_write_ha_state()
+        await self.coordinator.async_power_command_sent(False)
+
 
 class NecProjectorShutterSwitch(CoordinatorEntity, SwitchEntity):
     """Representation of a NEC Projector shutter switch."""
@@ -84,7 +98,7 @@ class NecProjectorShutterSwitch(CoordinatorEntity, SwitchEntity):
         self, coordinator: NecProjectorCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("shutter_status",))
         self._entry = entry
         self._attr_unique_id = f"{entry.unique_id}_shutter"
         self._attr_name = f"{entry.title} Shutter"
@@ -96,26 +110,106 @@ class NecProjectorShutterSwitch(CoordinatorEntity, SwitchEntity):
             identifiers={(DOMAIN, self._entry.unique_id)}, name=self._entry.title
         )
 
+    @property
+    def available(self) -> bool:
+        """Return True if the shutter can be read from the projector."""
+        return super().available and self.coordinator.field_available(FIELD_SHUTTER)
+
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
         if self.coordinator.data:
-            self._attr_is_on = self.coordinator.data.get("shutter_status", False) == "open"
+            self._attr_is_on = self.coordinator.data.shutter_status == "open"
     
         self.async_write_ha_state()
     
     @callback
     def _handle_coordinator_update(self) -> None:
         if self.coordinator.data:
-            self._attr_is_on = self.coordinator.data.get("shutter_status", False) == "open"
+            self._attr_is_on = self.coordinator.data.shutter_status == "open"
     
         self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs) -> None:
         await self.coordinator.api.async_open_shutter()
         self._attr_is_on = True
+        self.coordinator.async_invalidate_keys("shutter_status")
         self.async_write_ha_state()
+        await self.coordinator.async_refresh_fields(FIELD_SHUTTER)
 
     async def async_turn_off(self, **kwargs) -> None:
         await self.coordinator.api.async_close_shutter()
         self._attr_is_on = False
+        self.coordinator.async_invalidate_keys("shutter_status")
         self.async_write_ha_state()
+        await self.coordinator.async_refresh_fields(FIELD_SHUTTER)
+
+
+class NecProjectorGroupPowerSwitch(NecProjectorGroupEntity, SwitchEntity):
+    """Power switch of a group of NEC projectors, on if any member is on."""
+
+    def __init__(self, group: NecProjectorGroup, entry: ConfigEntry) -> None:
+        """Initialize the switch."""
+        super().__init__(group, entry, ("power_on",))
+        self._attr_unique_id = f"{entry.unique_id}_power"
+        self._attr_name = f"{entry.title} Power"
+
+    def _update_from_members(self) -> None:
+        values = self.member_values("power_on")
+        self._attr_is_on = any(values) if values else None
+
+    async def _async_set_power(self, power_on: bool) -> None:
+        coordinators = await self.group.async_send(
+            CMD_POWER_ON if power_on else CMD_POWER_OFF
+        )
+        self._attr_is_on = power_on
+        self._update_from_command()
+        for coordinator in coordinators:
+            coordinator.async_invalidate_keys("power_on")
+        self.async_write_ha_state()
+        await asyncio.gather(
+            *(coordinator.async_power_command_sent(power_on) for coordinator in coordinators)
+        )
+
+    async def async_turn_on(self, **kwargs) -> None:
+        """Turn all projectors of the group on."""
+        await self._async_set_power(True)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        """Turn all projectors of the group off."""
+        await self._async_set_power(False)
+
+
+class NecProjectorGroupShutterSwitch(NecProjectorGroupEntity, SwitchEntity):
+    """Shutter switch of a group of NEC projectors, on if any shutter is open."""
+
+    def __init__(self, group: NecProjectorGroup, entry: ConfigEntry) -> None:
+        """Initialize the switch."""
+        super().__init__(group, entry, ("shutter_status",))
+        self._attr_unique_id = f"{entry.unique_id}_shutter"
+        self._attr_name = f"{entry.title} Shutter"
+
+    def _update_from_members(self) -> None:
+        values = self.member_values("shutter_status")
+        self._attr_is_on = any(value == "open" for value in values) if values else None
+
+    async def _async_set_shutter(self, is_open: bool) -> None:
+        coordinators = await self.group.async_send(
+            CMD_SHUTTER_OPEN if is_open else CMD_SHUTTER_CLOSE,
+            self.group.members_supporting(FIELD_SHUTTER),
+        )
+        self._attr_is_on = is_open
+        self._update_from_command()
+        for coordinator in coordinators:
+            coordinator.async_invalidate_keys("shutter_status")
+        self.async_write_ha_state()
+        await asyncio.gather(
+            *(coordinator.async_refresh_fields(FIELD_SHUTTER) for coordinator in coordinators)
+        )
+
+    async def async_turn_on(self, **kwargs) -> None:
+        """Open the shutters of the group."""
+        await self._async_set_shutter(True)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        """Close the shutters of the group."""
+        await self._async_set_shutter(False)
@@ -0,0 +1,91 @@
+"""Protocol trace recording for the NEC Projector integration."""
+
+import struct
+import time
+from collections import deque
+from typing import NamedTuple
+
+# Binary trace file layout
+TRACE_MAGIC = b"NECT"
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct("<4sB")
+# Wall clock time, latency in seconds, command length, response length
+TRACE_RECORD = struct.Struct("<dfHH")
+
+
+class TraceRecord(NamedTuple):
+    """One command sent to a projector and the reply it got."""
+
+    timestamp: float
+    latency: float
+    command: bytes
+    response: bytes
+
+
+class ProtocolTrace:
+    """Ring buffer of the latest exchanges with one projector.
+
+    Memory is bounded by the capacity, older records are dropped first. A
+    response of a timed out exchange is recorded empty.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty trace."""
+        self._records: deque[TraceRecord] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        """Return the number of records held."""
+        return len(self._records)
+
+    def record(self, command: bytes, response: bytes, latency: float) -> None:
+        """Record one exchange."""
+        self._records.append(TraceRecord(time.time(), latency, command, response))
+
+    def records(self) -> list[TraceRecord]:
+        """Return the records, oldest first."""
+        return list(self._records)
+
+    def export(self) -> bytes:
+        """Return the records as a binary trace file."""
+        return encode_trace(self._records)
+
+
+def encode_trace(records) -> bytes:
+    """Encode records into the binary trace file format."""
+    chunks = [TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION)]
+    for timestamp, latency, command, response in records:
+        chunks.append(
+            TRACE_RECORD.pack(timestamp, latency, len(command), len(response))
+        )
+        chunks.append(command)
+        chunks.append(response)
+    return b"".join(chunks)
+
+
+def decode_trace(data: bytes) -> list[TraceRecord]:
+    """Decode a binary trace file.
+
+    Raises ValueError if the data is not a trace file of a known version.
+    """
+    if len(data) < TRACE_HEADER.size:
+        raise ValueError("Not a protocol trace")
+    magic, version = TRACE_HEADER.unpack_from(data)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError("Not a protocol trace of a supported version")
+    records = []
+    offset = TRACE_HEADER.size
+    while offset < len(data):
+        if offset + TRACE_RECORD.size > len(data):
+            raise ValueError("Truncated protocol trace")
+        timestamp, latency, command_length, response_length = (
+            TRACE_RECORD.unpack_from(data, offset)
+        )
+        offset += TRACE_RECORD.size
+        command = data[offset : offset + command_length]
+        offset += command_length
+        response = data[offset : offset + response_length]
+        offset += response_length
+        if offset > len(data):
+            raise ValueError("Truncated protocol trace")
+        records.append(TraceRecord(timestamp, latency, command, response))
+    return records
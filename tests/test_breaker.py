@@ -0,0 +1,105 @@
+"""Tests for the circuit breaker and the round trip estimator."""
+
+import pytest
+
+from tools._integration import load
+
+breaker = load("breaker")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Return a settable monotonic clock used by the breaker."""
+    now = [1000.0]
+    monkeypatch.setattr(breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_circuit_opens_after_threshold(clock: list[float]) -> None:
+    """The circuit opens on the threshold-th failure in a row."""
+    circuit = breaker.CircuitBreaker(threshold=3, min_backoff=5, max_backoff=120)
+    assert not circuit.record_failure()
+    assert not circuit.record_failure()
+    assert circuit.state == breaker.STATE_CLOSED
+    assert circuit.record_failure()
+    assert circuit.state == breaker.STATE_OPEN
+    assert circuit.retry_in == 5
+
+
+def test_success_resets_failures(clock: list[float]) -> None:
+    """A success in between keeps the circuit closed."""
+    circuit = breaker.CircuitBreaker(threshold=3)
+    circuit.record_failure()
+    circuit.record_failure()
+    assert not circuit.record_success()
+    circuit.record_failure()
+    assert circuit.state == breaker.STATE_CLOSED
+
+
+def test_half_open_after_backoff(clock: list[float]) -> None:
+    """The circuit is half open once the backoff has passed."""
+    circuit = breaker.CircuitBreaker(threshold=1, min_backoff=5, max_backoff=120)
+    circuit.record_failure()
+    clock[0] += 5
+    assert circuit.state == breaker.STATE_HALF_OPEN
+    assert circuit.retry_in == 0
+    assert circuit.record_success()
+    assert circuit.state == breaker.STATE_CLOSED
+    assert circuit.backoff == 0
+
+
+def test_backoff_doubles_up_to_maximum(clock: list[float]) -> None:
+    """A failed probe opens the circuit again for twice as long."""
+    circuit = breaker.CircuitBreaker(threshold=1, min_backoff=5, max_backoff=12)
+    backoffs = []
+    for _ in range(4):
+        circuit.record_failure()
+        backoffs.append(circuit.backoff)
+    assert backoffs == [5, 10, 12, 12]
+    # Only the failure that tripped the circuit reports it as just opened.
+    assert not circuit.record_failure()
+
+
+def test_as_dict(clock: list[float]) -> None:
+    """The state is serializable for diagnostics."""
+    circuit = breaker.CircuitBreaker(threshold=1, min_backoff=5)
+    circuit.record_failure()
+    clock[0] += 2
+    assert circuit.as_dict() == {
+        "state": breaker.STATE_OPEN,
+        "failures": 1,
+        "backoff": 5,
+        "retry_in": 3.0,
+    }
+
+
+def test_estimator_without_samples() -> None:
+    """Without samples the timeout is the maximum."""
+    assert breaker.RoundTripEstimator().timeout(1.0, 5.0) == 5.0
+
+
+def test_estimator_first_sample() -> None:
+    """The first sample sets the mean and half of it as the variation."""
+    estimator = breaker.RoundTripEstimator()
+    estimator.record(0.2)
+    assert estimator.srtt == pytest.approx(0.2)
+    assert estimator.rttvar == pytest.approx(0.1)
+    assert estimator.timeout(0.0, 5.0) == pytest.approx(0.6)
+
+
+def test_estimator_smoothing() -> None:
+    """Later samples are smoothed with the RFC 6298 gains."""
+    estimator = breaker.RoundTripEstimator()
+    estimator.record(0.2)
+    estimator.record(0.4)
+    assert estimator.rttvar == pytest.approx(0.1 + 0.25 * (0.2 - 0.1))
+    assert estimator.srtt == pytest.approx(0.2 + 0.125 * 0.2)
+
+
+def test_estimator_timeout_bounds() -> None:
+    """The timeout stays between the minimum and the maximum."""
+    estimator = breaker.RoundTripEstimator()
+    estimator.record(0.01)
+    assert estimator.timeout(1.0, 5.0) == 1.0
+    estimator.record(10.0)
+    assert estimator.timeout(1.0, 5.0) == 5.0
@@ -0,0 +1,188 @@
+"""Tests for the protocol codec and the reply frame reader."""
+
+import asyncio
+
+import pytest
+
+from tools._integration import load
+
+api = load("api")
+codec = load("codec")
+const = load("const")
+
+
+def frame(header: bytes, data: bytes = b"") -> bytes:
+    """Return a binary reply frame with its data length and checksum."""
+    body = header[:4] + bytes((len(data),)) + data
+    return body + bytes((codec.checksum(body),))
+
+
+def status_reply(power: int, status: int, model: int = 0x10) -> bytes:
+    """Return a running status reply."""
+    return frame(codec.REPLY_STATUS + b"\x00" + bytes((model,)), bytes((0, 0, power, 0, 0, status)))
+
+
+ERROR_REPLY = frame(b"\xa0\x85\x00\x10", b"\x00\x00")
+
+
+def test_checksum() -> None:
+    """The checksum is the low byte of the sum of the frame."""
+    assert codec.checksum(b"") == 0
+    assert codec.checksum(codec.CMD_STATUS_QUERY[:-1]) == codec.CMD_STATUS_QUERY[-1]
+    assert codec.checksum(b"\xff\x02") == 0x01
+
+
+def test_binary_frame_length() -> None:
+    """The frame length is the header, the data length and the checksum."""
+    assert codec.binary_frame_length(b"\x20\x85\x00\x10\x00") == 6
+    assert codec.binary_frame_length(b"\x20\x85\x00\x10\x06") == 12
+    assert codec.binary_frame_length(status_reply(1, 0x04)) == len(status_reply(1, 0x04))
+
+
+def test_verify_binary_reply() -> None:
+    """A reply of the expected type, length and checksum passes."""
+    codec.verify_binary_reply(status_reply(1, 0x04), codec.REPLY_STATUS)
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(status_reply(1, 0x04)[:5], id="header only"),
+        pytest.param(status_reply(1, 0x04)[:-1], id="truncated"),
+        pytest.param(status_reply(1, 0x04) + b"\x00", id="trailing byte"),
+        pytest.param(status_reply(1, 0x04)[:-1] + b"\x00", id="bad checksum"),
+        pytest.param(frame(codec.REPLY_LAMP + b"\x00\x10", b"\x00" * 6), id="other reply"),
+        pytest.param(ERROR_REPLY, id="error reply"),
+    ],
+)
+def test_verify_binary_reply_invalid(reply: bytes) -> None:
+    """Malformed replies and replies of another type are rejected."""
+    with pytest.raises(codec.ProjectorCommandError):
+        codec.verify_binary_reply(reply, codec.REPLY_STATUS)
+
+
+@pytest.mark.parametrize(
+    ("power", "status", "expected"),
+    [
+        (0x01, 0x04, (True, const.ProjectorStatus.POWER_ON, 0x10)),
+        (0x00, 0x00, (False, const.ProjectorStatus.STANDBY, 0x10)),
+        (0x00, 0x05, (False, const.ProjectorStatus.COOLING, 0x10)),
+        (0x01, 0xFF, (True, const.ProjectorStatus.NOT_SUPPORTED, 0x10)),
+        (0x01, 0x42, (True, const.ProjectorStatus.INVALID, 0x10)),
+    ],
+)
+def test_decode_status(power: int, status: int, expected: tuple) -> None:
+    """The power flag, status name and model code are decoded."""
+    assert codec.decode_status(status_reply(power, status)) == expected
+
+
+def test_decode_status_model_code() -> None:
+    """The model code is read from the reply header."""
+    assert codec.decode_status(status_reply(1, 0x04, model=0x2A))[2] == 0x2A
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        pytest.param(status_reply(1, 0x04)[:-1], id="truncated"),
+        pytest.param(frame(codec.REPLY_STATUS + b"\x00\x10", b"\x00\x00\x01"), id="short data"),
+        pytest.param(ERROR_REPLY, id="error reply"),
+        pytest.param(b"err\r", id="ascii error"),
+    ],
+)
+def test_decode_status_invalid(reply: bytes) -> None:
+    """Truncated, short and error replies do not decode."""
+    with pytest.raises(codec.ProjectorCommandError):
+        codec.decode_status(reply)
+
+
+@pytest.mark.parametrize(
+    ("reply", "expected"),
+    [
+        pytest.param(ERROR_REPLY, True, id="binary error"),
+        pytest.param(b"err\r", True, id="ascii error"),
+        pytest.param(status_reply(1, 0x04), False, id="binary reply"),
+        pytest.param(b"lens zoom cur=500 max=1000 min=0\r", False, id="ascii reply"),
+        pytest.param(ERROR_REPLY[:-1], False, id="truncated error"),
+        pytest.param(ERROR_REPLY[:-1] + b"\x00", False, id="garbled error"),
+        pytest.param(b"", False, id="empty"),
+    ],
+)
+def test_is_error_reply(reply: bytes, expected: bool) -> None:
+    """Only complete error replies report a rejected command."""
+    assert codec.is_error_reply(reply) is expected
+
+
+def test_check_reply() -> None:
+    """An error reply raises the rejection error, other replies pass."""
+    with pytest.raises(codec.ProjectorRejectedError):
+        codec.check_reply(ERROR_REPLY)
+    with pytest.raises(codec.ProjectorRejectedError):
+        codec.check_reply(b"err\r")
+    codec.check_reply(status_reply(1, 0x04))
+
+
+def test_decode_rejected_reply() -> None:
+    """The API reports error replies as rejections, not parse failures."""
+    projector = api.NecProjectorApi("127.0.0.1")
+    _, parser = api.STATUS_QUERY
+    with pytest.raises(codec.ProjectorRejectedError):
+        projector._decode(parser, ERROR_REPLY)
+    assert projector.stats.parse_failures == 0
+    with pytest.raises(codec.ProjectorCommandError):
+        projector._decode(parser, status_reply(1, 0x04)[:-1])
+    assert projector.stats.parse_failures == 1
+
+
+def read_frames(chunks: list[bytes], commands: list[bytes]) -> list[bytes]:
+    """Feed chunks to a frame reader and read one reply per command."""
+
+    async def read() -> list[bytes]:
+        stream = asyncio.StreamReader()
+        for chunk in chunks:
+            stream.feed_data(chunk)
+        stream.feed_eof()
+        reader = api._FrameReader(stream)
+        return [await reader.read_reply(command) for command in commands]
+
+    return asyncio.run(read())
+
+
+def test_frame_reader() -> None:
+    """Binary and ASCII replies are split into frames, keeping trailing bytes."""
+    binary = status_reply(1, 0x04)
+    data = binary + b"shutter cur=open\r\n" + ERROR_REPLY + b"err\r"
+    chunks = [data[index : index + 3] for index in range(0, len(data), 3)]
+    commands = [
+        codec.CMD_STATUS_QUERY,
+        codec.CMD_SHUTTER_QUERY,
+        codec.CMD_STATUS_QUERY,
+        codec.CMD_INPUT_QUERY,
+    ]
+    assert read_frames(chunks, commands) == [
+        binary,
+        b"shutter cur=open\r",
+        ERROR_REPLY,
+        b"err\r",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("data", "command"),
+    [
+        pytest.param(status_reply(1, 0x04)[:3], codec.CMD_STATUS_QUERY, id="binary header"),
+        pytest.param(status_reply(1, 0x04)[:-1], codec.CMD_STATUS_QUERY, id="binary data"),
+        pytest.param(b"shutter cur=open", codec.CMD_SHUTTER_QUERY, id="ascii"),
+    ],
+)
+def test_frame_reader_truncated(data: bytes, command: bytes) -> None:
+    """A frame cut off by the end of the session fails the read."""
+    with pytest.raises(ConnectionResetError):
+        read_frames([data], [command])
+
+
+def test_frame_reader_limit() -> None:
+    """An ASCII reply without a terminator is not buffered without limit."""
+    with pytest.raises(codec.ProjectorCommandError):
+        read_frames([b"x" * (api.MAX_FRAME_LENGTH + 1)], [codec.CMD_SHUTTER_QUERY])
@@ -0,0 +1,87 @@
+"""Tests for the fleet poll scheduler."""
+
+import asyncio
+
+import pytest
+
+from tools._integration import load
+
+scheduler_module = load("scheduler")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Return a settable wall clock and remove the phase jitter."""
+    now = [1000.0]
+    monkeypatch.setattr(scheduler_module.time, "time", lambda: now[0])
+    monkeypatch.setattr(scheduler_module.random, "uniform", lambda low, high: low)
+    return now
+
+
+def test_phases_are_spread(clock: list[float]) -> None:
+    """Members start evenly spread over the startup window."""
+    scheduler = scheduler_module.NecProjectorPollScheduler()
+    for member in "abcd":
+        scheduler.register(member)
+    assert [scheduler.startup_delay(member, 40) for member in "abcd"] == [0, 10, 20, 30]
+    assert scheduler.startup_delay("unknown", 40) == 0
+
+
+def test_unregister_rebalances(clock: list[float]) -> None:
+    """The remaining members are spread again."""
+    scheduler = scheduler_module.NecProjectorPollScheduler()
+    for member in "abcd":
+        scheduler.register(member)
+    scheduler.unregister("b")
+    scheduler.unregister("d")
+    assert [scheduler.startup_delay(member, 40) for member in "ac"] == [0, 20]
+    assert scheduler.stats["projectors"] == 2
+
+
+def test_next_interval_follows_phase(clock: list[float]) -> None:
+    """The next poll lands on the member's phase within the interval."""
+    scheduler = scheduler_module.NecProjectorPollScheduler()
+    scheduler.register("a")
+    scheduler.register("b")
+    # The phase of b is half the interval: slots at 1005, 1035, 1065, ...
+    clock[0] = 1010
+    assert scheduler.next_interval("b", 30) == pytest.approx(25)
+    clock[0] = 1000
+    assert scheduler.next_interval("b", 30) == pytest.approx(35)
+    # The slots of a are half an interval away: 1020, 1050, ...
+    assert scheduler.next_interval("a", 30) == pytest.approx(20)
+
+
+def test_next_interval_at_least_half_an_interval(clock: list[float]) -> None:
+    """A slot closer than half an interval is skipped."""
+    scheduler = scheduler_module.NecProjectorPollScheduler()
+    scheduler.register("a")
+    for now in (1000.0, 1007.0, 1016.0, 1029.0):
+        clock[0] = now
+        assert 15 <= scheduler.next_interval("a", 30) <= 45
+
+
+def test_next_interval_unknown_member(clock: list[float]) -> None:
+    """An unregistered member keeps the plain interval."""
+    scheduler = scheduler_module.NecProjectorPollScheduler()
+    assert scheduler.next_interval("a", 30) == 30
+
+
+def test_poll_slot_records_lag(clock: list[float]) -> None:
+    """A poll starting after its slot records how late it was."""
+    scheduler = scheduler_module.NecProjectorPollScheduler()
+    scheduler.register("a")
+    clock[0] += scheduler.next_interval("a", 30) + 2
+
+    async def poll() -> int:
+        async with scheduler.async_poll_slot("a"):
+            return scheduler.stats["polls_in_flight"]
+
+    assert asyncio.run(poll()) == 1
+    assert scheduler.lag("a") == pytest.approx(2)
+    assert scheduler.stats == {
+        "projectors": 1,
+        "polls_in_flight": 0,
+        "max_lag": pytest.approx(2),
+        "mean_lag": pytest.approx(2),
+    }
@@ -0,0 +1,96 @@
+"""Tests for the projector state snapshot and the metadata cache."""
+
+from tools._integration import load
+
+const = load("const")
+metadata = load("metadata")
+state = load("state")
+
+
+def test_merge_returns_self_when_unchanged() -> None:
+    """Merging equal values keeps the same snapshot."""
+    snapshot = state.NecProjectorState(power_on=True, zoom_value=500)
+    assert snapshot.merge({"power_on": True, "zoom_value": 500}) is snapshot
+    assert snapshot.merge({}) is snapshot
+
+
+def test_merge_replaces_fields() -> None:
+    """Merging changed values returns a new snapshot."""
+    snapshot = state.NecProjectorState(power_on=True, zoom_value=500)
+    merged = snapshot.merge({"zoom_value": 400, "input_value": "hdmi1"})
+    assert merged is not snapshot
+    assert merged.zoom_value == 400
+    assert merged.input_value == "hdmi1"
+    assert merged.power_on is True
+    assert snapshot.zoom_value == 500
+
+
+def test_changed_fields() -> None:
+    """Only the fields that differ are reported."""
+    snapshot = state.NecProjectorState(power_on=True, zoom_value=500)
+    merged = snapshot.merge({"zoom_value": 400, "power_on": True})
+    assert merged.changed_fields(snapshot) == {"zoom_value"}
+    assert snapshot.changed_fields(snapshot) == set()
+
+
+def test_dict_round_trip() -> None:
+    """A snapshot survives serialization."""
+    snapshot = state.NecProjectorState(
+        power_on=True,
+        status=const.ProjectorStatus.POWER_ON,
+        model_code=0x10,
+        zoom_value=500,
+        lamp_usage=1234.5,
+    )
+    assert state.NecProjectorState.from_dict(snapshot.as_dict()) == snapshot
+
+
+def test_from_dict_converts_persisted_values() -> None:
+    """Persisted values are converted back, unknown keys are ignored."""
+    restored = state.NecProjectorState.from_dict(
+        {
+            "status": "Power on",
+            "zoom_value": 500.0,
+            "input_value": None,
+            "removed_field": 1,
+        }
+    )
+    assert restored.status is const.ProjectorStatus.POWER_ON
+    assert restored.zoom_value == 500
+    assert isinstance(restored.zoom_value, int)
+    assert restored.input_value is None
+
+
+def test_from_dict_unknown_status() -> None:
+    """A status name that no longer exists reads as invalid."""
+    restored = state.NecProjectorState.from_dict({"status": "Warming up"})
+    assert restored.status is const.ProjectorStatus.INVALID
+
+
+def test_metadata_cleared_on_new_session() -> None:
+    """Metadata read in one session is dropped by the next one."""
+    cache = metadata.NecProjectorMetadata()
+    cache.validate((1, 0), 0x10)
+    cache.lens_ranges = {"zoom": (0, 1000)}
+    cache.validate((1, 0), 0x10)
+    assert cache.lens_ranges == {"zoom": (0, 1000)}
+    cache.validate((2, 0), 0x10)
+    assert cache.lens_ranges == {}
+
+
+def test_restored_metadata_adopted_by_same_model() -> None:
+    """Restored metadata is kept by the first session of its model only."""
+    cache = metadata.NecProjectorMetadata()
+    cache.lens_ranges = {"zoom": (0, 1000)}
+    cache.input_options = ("hdmi1",)
+    cache.model_code = 0x10
+    cache.validate((1, 0), 0x10)
+    assert cache.lens_ranges == {"zoom": (0, 1000)}
+    assert cache.input_options == ("hdmi1",)
+
+    cache = metadata.NecProjectorMetadata()
+    cache.lens_ranges = {"zoom": (0, 1000)}
+    cache.model_code = 0x10
+    cache.validate((1, 0), 0x11)
+    assert cache.lens_ranges == {}
+    assert cache.model_code == 0x11
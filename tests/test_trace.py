@@ -0,0 +1,63 @@
+"""Tests for protocol trace recording and the trace file format."""
+
+import pytest
+
+from tools._integration import load
+
+trace = load("trace")
+
+RECORDS = [
+    trace.TraceRecord(1700000000.25, 0.5, b"\x00\x85\x00\x00\x01\x01\x87", b"\x20\x85"),
+    trace.TraceRecord(1700000001.0, 0.25, b"lens zoom ?\r", b""),
+]
+
+
+def test_round_trip() -> None:
+    """Encoded records decode to the same records."""
+    assert trace.decode_trace(trace.encode_trace(RECORDS)) == RECORDS
+
+
+def test_empty_trace() -> None:
+    """A trace without records is just the header."""
+    data = trace.encode_trace([])
+    assert data == trace.TRACE_MAGIC + bytes((trace.TRACE_VERSION,))
+    assert trace.decode_trace(data) == []
+
+
+def test_ring_buffer_keeps_latest() -> None:
+    """The trace holds at most its capacity, dropping the oldest records."""
+    recorder = trace.ProtocolTrace(2)
+    for index in range(3):
+        recorder.record(bytes((index,)), b"reply", 0.1)
+    assert len(recorder) == 2
+    assert [record.command for record in recorder.records()] == [b"\x01", b"\x02"]
+    assert [record.command for record in trace.decode_trace(recorder.export())] == [
+        b"\x01",
+        b"\x02",
+    ]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"NEC", id="short header"),
+        pytest.param(b"JSON\x01", id="magic"),
+        pytest.param(trace.TRACE_MAGIC + b"\x02", id="version"),
+    ],
+)
+def test_not_a_trace(data: bytes) -> None:
+    """Data that is not a trace of a known version is refused."""
+    with pytest.raises(ValueError):
+        trace.decode_trace(data)
+
+
+def test_truncated_trace() -> None:
+    """A trace cut anywhere but between records is refused."""
+    data = trace.encode_trace(RECORDS)
+    boundaries = {len(trace.encode_trace(RECORDS[:count])) for count in range(3)}
+    for length in range(trace.TRACE_HEADER.size, len(data)):
+        if length in boundaries:
+            continue
+        with pytest.raises(ValueError):
+            trace.decode_trace(data[:length])
@@ -0,0 +1,27 @@
+"""Import the integration modules that do not depend on Home Assistant.
+
+Importing ``custom_components.necprojector`` runs its ``__init__`` which needs
+Home Assistant. The tools only use the protocol layer, so the package is
+registered without executing ``__init__`` and its modules are imported from it.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+PACKAGE = "custom_components.necprojector"
+PACKAGE_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "necprojector"
+
+
+def load(module: str) -> types.ModuleType:
+    """Import a module of the integration without Home Assistant."""
+    if PACKAGE not in sys.modules:
+        parent = sys.modules.setdefault(
+            "custom_components", types.ModuleType("custom_components")
+        )
+        parent.__path__ = [str(PACKAGE_PATH.parent)]
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(PACKAGE_PATH)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
@@ -0,0 +1,269 @@
+"""Benchmark suite with stored baselines for the NEC Projector integration.
+
+Measures, on replies recorded from the simulator:
+
+- the parsing of ``async_get_status``, ``async_get_lens_value`` and
+  ``async_get_input_options`` replies,
+- a full ``NecProjectorCoordinator._async_update_data`` cycle against an API
+  answering from the recorded replies,
+- the fan-out of one data update to the entities of every platform for 1, 50
+  and 500 config entries.
+
+The coordinator and fan-out cases need Home Assistant and are skipped without
+it. Each case is compared with ``tools/bench_baseline.json`` and the run fails
+if one is slower than its baseline by more than the threshold, or if any
+case, skipped or not, has no baseline. Baselines depend on the machine, so
+record them with ``--save`` on the machine that runs the comparison.
+
+Example: ``python -m tools.bench --threshold 0.25``
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+import timeit
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+
+from ._integration import load
+from .simulator import ProjectorSimulator
+
+api_module = load("api")
+scheduler_module = load("scheduler")
+stats_module = load("stats")
+
+BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+FANOUT_ENTRIES = (1, 50, 500)
+ENTITY_PLATFORMS = ("switch", "number", "sensor", "select")
+
+# Relative cost of one run of each kind of case, to keep their durations close
+PARSE_WEIGHT = 1
+COORDINATOR_WEIGHT = 20
+FANOUT_WEIGHT = 2
+
+
+class RecordedReplies(dict):
+    """Replies of a simulated projector, recorded once per command."""
+
+    def __init__(self) -> None:
+        """Initialize the recording."""
+        super().__init__()
+        self._simulator = ProjectorSimulator()
+
+    def __missing__(self, command: bytes) -> bytes:
+        reply = self[command] = self._simulator._handle_command(command, 0.0)
+        return reply
+
+
+REPLIES = RecordedReplies()
+
+
+class RecordedApi:
+    """API answering the coordinator's queries with recorded replies.
+
+    Replies go through the parsers of the API, so a poll costs everything but
+    the network.
+    """
+
+    pipelining = True
+    session_resets = 0
+
+    def __init__(self) -> None:
+        """Initialize the API."""
+        self.stats = stats_module.NecProjectorApiStats()
+
+    async def async_get_status(self, priority: int = api_module.PRIORITY_POLL) -> dict:
+        """Return the parsed recorded status reply."""
+        command, parser = api_module.STATUS_QUERY
+        return parser(REPLIES[command])
+
+    async def async_query_batch(
+        self, queries, priority: int = api_module.PRIORITY_POLL
+    ) -> list:
+        """Return the parsed recorded replies of a batch."""
+        return [
+            api_module.QueryResult(parser(REPLIES[command]), None, 0.0)
+            for command, parser in queries
+        ]
+
+
+def parse_cases() -> dict[str, Callable[[], object]]:
+    """Return the parsing cases, run the way the API getters decode replies."""
+    api = api_module.NecProjectorApi("127.0.0.1")
+    cases = {}
+    for name, (command, parser) in (
+        ("async_get_status", api_module.STATUS_QUERY),
+        ("async_get_lens_value", api_module.lens_query("zoom", with_range=True)),
+        ("async_get_input_options", api_module.INPUT_OPTIONS_QUERY),
+    ):
+        reply = REPLIES[command]
+        cases[name] = lambda parser=parser, reply=reply: api._decode(parser, reply)
+    return cases
+
+
+def time_sync(func: Callable[[], object], number: int, repeat: int) -> float:
+    """Return the best time of a call in nanoseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+async def time_async(
+    func: Callable[[], Awaitable[object]], number: int, repeat: int
+) -> float:
+    """Return the best time of an awaited call in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e9
+
+
+async def async_setup_entries(hass, count: int) -> list:
+    """Set up coordinators and the entities of every platform for some entries."""
+    coordinator_module = load("coordinator")
+    platforms = {platform: load(platform) for platform in ENTITY_PLATFORMS}
+    scheduler = scheduler_module.NecProjectorPollScheduler()
+    coordinators = []
+    for index in range(count):
+        coordinator = coordinator_module.NecProjectorCoordinator(
+            hass, RecordedApi(), scheduler
+        )
+        scheduler.register(coordinator)
+        coordinator.data = await coordinator._async_update_data()
+        entry = SimpleNamespace(
+            entry_id=f"bench{index}", unique_id=f"bench{index}", title=f"Bench {index}"
+        )
+        hass.data[entry.entry_id] = coordinator
+        for platform_name, platform in platforms.items():
+            entities = []
+            await platform.async_setup_entry(hass, entry, entities.extend)
+            for number, entity in enumerate(entities):
+                entity.hass = hass
+                entity.entity_id = f"{platform_name}.bench_{index}_{number}"
+                await entity.async_added_to_hass()
+        coordinators.append(coordinator)
+    return coordinators
+
+
+async def async_ha_cases(number: int, repeat: int) -> dict[str, float]:
+    """Run the cases that need Home Assistant."""
+    from homeassistant.core import HomeAssistant
+
+    # The entities are attached without an entity platform, which Home
+    # Assistant reports with a warning for each of them.
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+    results = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+
+        [coordinator] = await async_setup_entries(hass, 1)
+        results["coordinator_update"] = await time_async(
+            coordinator._async_update_data, max(1, number // COORDINATOR_WEIGHT), repeat
+        )
+
+        for count in FANOUT_ENTRIES:
+            hass.data.clear()
+            coordinators = await async_setup_entries(hass, count)
+            # Alternate between two states so every update changes the data.
+            updates = [
+                {"power_on": True, "zoom_value": 400, "input_value": "hdmi2"},
+                {"power_on": True, "zoom_value": 500, "input_value": "hdmi1"},
+            ]
+            flip = [0]
+
+            async def fan_out(coordinators=coordinators, updates=updates, flip=flip) -> None:
+                flip[0] ^= 1
+                for coordinator in coordinators:
+                    coordinator.async_merge_data(updates[flip[0]])
+
+            results[f"fanout_{count}"] = await time_async(
+                fan_out, max(1, number // (FANOUT_WEIGHT * count)), repeat
+            )
+    return results
+
+
+def run(number: int, repeat: int) -> tuple[dict[str, float], list[str]]:
+    """Run every case and return the timings and the skipped cases."""
+    results = {
+        name: time_sync(func, max(1, number // PARSE_WEIGHT), repeat)
+        for name, func in parse_cases().items()
+    }
+    skipped = []
+    try:
+        results |= asyncio.run(async_ha_cases(number, repeat))
+    except ModuleNotFoundError as exc:
+        if not (exc.name or "").startswith("homeassistant"):
+            raise
+        skipped = ["coordinator_update", *(f"fanout_{count}" for count in FANOUT_ENTRIES)]
+    return results, skipped
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print the results against the baseline and return the regressed cases."""
+    regressions = []
+    print(f"{'case':<26}{'ns/op':>14}{'baseline':>14}{'change':>10}")
+    for name, value in results.items():
+        if (reference := baseline.get(name)) is None:
+            print(f"{name:<26}{value:>14.0f}{'-':>14}{'':>10}  NO BASELINE")
+            continue
+        change = value / reference - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<26}{value:>14.0f}{reference:>14.0f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="calls per parsing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 for 25%%"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    args = parser.parse_args()
+
+    results, skipped = run(args.number, args.repeat)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.threshold)
+    for name in skipped:
+        print(f"{name:<26}{'skipped, Home Assistant is not installed':>38}")
+    missing = [name for name in [*results, *skipped] if name not in baseline]
+
+    if args.save:
+        # Keep the baselines of cases that could not run here.
+        baseline |= {name: round(value, 1) for name, value in results.items()}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return
+    failed = False
+    if regressions:
+        print(f"{len(regressions)} cases regressed by more than {args.threshold:.0%}")
+        failed = True
+    if missing:
+        # A case without a baseline is never checked, so the run fails until
+        # every case has one, including those that could not run here.
+        print(
+            f"No baseline for {', '.join(missing)}: record them with --save"
+            " on a machine with Home Assistant installed",
+            file=sys.stderr,
+        )
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
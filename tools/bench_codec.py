@@ -0,0 +1,86 @@
+"""Microbenchmarks of the protocol codec.
+
+Compares the codec against the per-call regex parsing and command formatting
+it replaced, on representative projector replies.
+
+Example: ``python -m tools.bench_codec --number 100000``
+"""
+
+import argparse
+import re
+import timeit
+
+from ._integration import load
+
+codec = load("codec")
+
+STATUS_REPLY = bytes.fromhex("2085011010" "0000010000040000" "0000000000000000")
+STATUS_REPLY += bytes((codec.checksum(STATUS_REPLY),))
+LENS_REPLY = b"lens zoom cur=512 max=1000 min=0\r"
+INPUT_REPLY = b"input cur=hdmi1 sel=hdmi1|hdmi2|displayport|hdbaset\r"
+
+
+def legacy_lens(reply: bytes) -> tuple[str, str, str]:
+    """Parse a lens reply the way the API did before the codec."""
+    decoded = reply.decode()
+    lens_value = re.search("(?<=cur\\=)\\d+", decoded)
+    max_value = re.search("(?<=max\\=)\\d+", decoded)
+    min_value = re.search("(?<=min\\=)\\d+", decoded)
+    return lens_value.group(), max_value.group(), min_value.group()
+
+
+def legacy_input(reply: bytes) -> tuple[str, list[str]]:
+    """Parse an input reply the way the API did before the codec."""
+    decoded = reply.decode()
+    input_value = re.search("(?<=cur\\=)\\w+", decoded)
+    input_options = re.search("(?<=sel\\=)[\\w|]+", decoded)
+    return input_value.group(), input_options.group().split("|")
+
+
+def legacy_status(reply: bytes) -> tuple[bool, str]:
+    """Decode a status reply the way the API did before the codec."""
+    status = {
+        0x00: "Standby (Sleep)",
+        0x04: "Power on",
+        0x05: "Cooling",
+        0x06: "Standby (error)",
+        0x0F: "Standby (Power saving)",
+        0x10: "Network standby",
+        0xFF: "Not supported",
+    }.get(reply[10], "Invalid status")
+    return reply[7] == 0x01, status
+
+
+def legacy_lens_query(axis: str) -> bytes:
+    """Build a lens query the way the API did before the codec."""
+    return "lens {lens_subcmd} {lens_arg}\r".format(lens_subcmd=axis, lens_arg="?").encode("ascii")
+
+
+CASES = {
+    "status": (lambda: legacy_status(STATUS_REPLY), lambda: codec.decode_status(STATUS_REPLY)),
+    "lens": (lambda: legacy_lens(LENS_REPLY), lambda: codec.decode_lens(LENS_REPLY)),
+    "input": (lambda: legacy_input(INPUT_REPLY), lambda: codec.decode_input(INPUT_REPLY)),
+    "lens_query": (lambda: legacy_lens_query("zoom"), lambda: codec.lens_query("zoom")),
+}
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<12}{'legacy ns':>12}{'codec ns':>12}{'speedup':>10}")
+    for name, (legacy, current) in CASES.items():
+        legacy_ns, current_ns = (
+            min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+            / args.number
+            * 1e9
+            for func in (legacy, current)
+        )
+        print(f"{name:<12}{legacy_ns:>12.0f}{current_ns:>12.0f}{legacy_ns / current_ns:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Run one operation across a fleet of NEC projectors from the command line.
+
+Reads an inventory file with one ``host[:port] [name]`` per line (blank lines
+and ``#`` comments are ignored), runs the operation on every projector with
+``NecProjectorApi`` and bounded concurrency, and prints one JSON line per
+projector as soon as it finishes. A timing summary is printed to stderr and
+the exit status is 1 if any projector failed.
+
+Examples::
+
+    python -m tools.fleet hosts.txt status
+    python -m tools.fleet --max-concurrent 64 hosts.txt power off
+    python -m tools.fleet hosts.txt lens zoom 500
+    python -m tools.fleet hosts.txt ascii "lamp ?"
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+
+from ._integration import load
+from .loadtest import percentile
+
+api_module = load("api")
+const = load("const")
+
+# An operation runs against one projector and returns a serializable result
+Operation = Callable[[object], Awaitable[object]]
+
+
+class Target(NamedTuple):
+    """One projector of the inventory."""
+
+    host: str
+    port: int
+    name: str
+
+
+def parse_inventory(lines) -> list[Target]:
+    """Parse the lines of an inventory file."""
+    targets = []
+    for number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        address, _, name = line.partition(" ")
+        host, _, port = address.partition(":")
+        try:
+            targets.append(Target(host, int(port or const.DEFAULT_PORT), name.strip() or host))
+        except ValueError as exc:
+            raise ValueError(f"line {number}: invalid port in {address!r}") from exc
+    return targets
+
+
+async def async_status(api) -> dict:
+    """Read the power status, shutter and input in one batch."""
+    results = await api.async_query_batch(
+        [api_module.STATUS_QUERY, api_module.SHUTTER_QUERY, api_module.INPUT_QUERY],
+        api_module.PRIORITY_USER,
+    )
+    status = {}
+    errors = [str(result.error) for result in results if result.error is not None]
+    for result in results:
+        if result.value is not None:
+            status.update(result.value)
+    if errors:
+        status["errors"] = errors
+    return status
+
+
+def build_operation(args: argparse.Namespace) -> Operation:
+    """Return the operation selected on the command line."""
+    if args.operation == "status":
+        return async_status
+    if args.operation == "power":
+        if args.state == "on":
+            return lambda api: api.async_power_on()
+        return lambda api: api.async_power_off()
+    if args.operation == "shutter":
+        if args.state == "open":
+            return lambda api: api.async_open_shutter()
+        return lambda api: api.async_close_shutter()
+    if args.operation == "input":
+        if args.value is None:
+            return lambda api: api.async_get_input_options()
+        return lambda api: api.async_set_input_option(args.value)
+    if args.operation == "lens":
+        if args.value is None:
+            return lambda api: api.async_get_lens_value(args.axis)
+        return lambda api: api.async_set_lens_value(args.axis, args.value)
+    if args.operation == "hex":
+        command = bytes.fromhex(args.command)
+        return lambda api: api.async_send_custom_command(command)
+    return lambda api: api.async_send_custom_ascii_command(args.command)
+
+
+async def async_run_target(
+    target: Target, operation: Operation, semaphore: asyncio.Semaphore, timeout: int
+) -> dict:
+    """Run the operation on one projector and return its result line."""
+    async with semaphore:
+        api = api_module.NecProjectorApi(target.host, target.port, timeout=timeout)
+        start = time.monotonic()
+        line = {"name": target.name, "host": target.host, "port": target.port}
+        try:
+            result = await operation(api)
+        except (api_module.ProjectorConnectionError, api_module.ProjectorCommandError) as exc:
+            line["ok"] = False
+            line["error"] = str(exc)
+        else:
+            line["ok"] = True
+            if result is not None:
+                line["result"] = result
+        finally:
+            await api.async_close()
+        line["elapsed"] = round(time.monotonic() - start, 3)
+        return line
+
+
+async def async_run_fleet(
+    targets: list[Target], operation: Operation, max_concurrent: int, timeout: int, out
+) -> dict:
+    """Run the operation on every projector, streaming results to ``out``."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    started = time.monotonic()
+    elapsed = []
+    failed = 0
+    for finished in asyncio.as_completed(
+        [async_run_target(target, operation, semaphore, timeout) for target in targets]
+    ):
+        line = await finished
+        elapsed.append(line["elapsed"])
+        failed += not line["ok"]
+        out.write(json.dumps(line) + "\n")
+        out.flush()
+    duration = time.monotonic() - started
+
+    elapsed.sort()
+    return {
+        "projectors": len(targets),
+        "succeeded": len(targets) - failed,
+        "failed": failed,
+        "duration": round(duration, 3),
+        "projectors_per_second": round(len(targets) / duration, 2) if duration else 0.0,
+        "elapsed_ms": {
+            name: round(percentile(elapsed, fraction) * 1000, 2)
+            for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+        },
+    }
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inventory", type=argparse.FileType("r"), help="inventory file, - for stdin")
+    parser.add_argument(
+        "--max-concurrent", type=int, default=const.DEFAULT_MAX_CONCURRENT_COMMANDS
+    )
+    parser.add_argument("--timeout", type=int, default=const.DEFAULT_TIMEOUT)
+    operations = parser.add_subparsers(dest="operation", required=True)
+    operations.add_parser("status", help="read power status, shutter and input")
+    operations.add_parser("power").add_argument("state", choices=("on", "off"))
+    operations.add_parser("shutter").add_argument("state", choices=("open", "close"))
+    input_parser = operations.add_parser("input", help="read the inputs or select one")
+    input_parser.add_argument("value", nargs="?")
+    lens_parser = operations.add_parser("lens", help="read a lens axis or move it")
+    lens_parser.add_argument("axis", choices=const.LENS_AXES)
+    lens_parser.add_argument("value", type=int, nargs="?")
+    operations.add_parser("hex", help="send a raw binary command").add_argument("command")
+    operations.add_parser("ascii", help="send a raw ASCII command").add_argument("command")
+    args = parser.parse_args()
+
+    try:
+        targets = parse_inventory(args.inventory)
+        operation = build_operation(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+    summary = asyncio.run(
+        async_run_fleet(targets, operation, args.max_concurrent, args.timeout, sys.stdout)
+    )
+    print(json.dumps(summary), file=sys.stderr)
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Fleet load test for the NEC Projector protocol layer.
+
+Starts a fleet of simulated projectors (or targets real ones given with
+``--target``), polls every projector with ``NecProjectorApi`` the way
+``NecProjectorCoordinator`` does while the projector is powered on, and reports
+poll latency percentiles, throughput and socket usage.
+
+Example: ``python -m tools.loadtest --count 150 --interval 5 --duration 60``
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from ._integration import load
+from .simulator import add_simulator_arguments, async_start_fleet, simulator_options
+
+api_module = load("api")
+const = load("const")
+scheduler_module = load("scheduler")
+
+
+async def async_poll(api) -> int:
+    """Run the full coordinator poll sequence and return the command count."""
+    await api.async_get_status()
+    queries = [api_module.lens_query(axis, with_range=True) for axis in const.LENS_AXES]
+    queries += [
+        api_module.INPUT_OPTIONS_QUERY,
+        api_module.SHUTTER_QUERY,
+        api_module.LAMP_USAGE_QUERY,
+        api_module.FILTER_USAGE_QUERY,
+    ]
+    await api.async_query_batch(queries)
+    return 1 + len(queries)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return a percentile of already sorted values."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, round(fraction * (len(values) - 1)))
+    return values[index]
+
+
+async def async_run_projector(
+    api, scheduler, interval: float, deadline: float, results: dict
+) -> None:
+    """Poll one projector on its fleet slot until the deadline."""
+    await asyncio.sleep(scheduler.next_interval(api, interval))
+    while time.monotonic() < deadline:
+        async with scheduler.async_poll_slot(api):
+            start = time.perf_counter()
+            try:
+                commands = await async_poll(api)
+            except (api_module.ProjectorConnectionError, api_module.ProjectorCommandError):
+                results["failures"] += 1
+            else:
+                results["commands"] += commands
+                results["latencies"].append(time.perf_counter() - start)
+        await asyncio.sleep(scheduler.next_interval(api, interval))
+
+
+async def async_load_test(args: argparse.Namespace) -> dict:
+    """Run the load test and return its report."""
+    simulators = []
+    if args.target:
+        targets = [
+            (host, int(port or const.DEFAULT_PORT))
+            for host, _, port in (target.partition(":") for target in args.target)
+        ]
+    else:
+        simulators = await async_start_fleet(args.count, simulator_options(args))
+        targets = [("127.0.0.1", simulator.port) for simulator in simulators]
+
+    apis = [
+        api_module.NecProjectorApi(host, port, pipelining=args.pipelining)
+        for host, port in targets
+    ]
+    scheduler = scheduler_module.NecProjectorPollScheduler(args.max_concurrent)
+    for api in apis:
+        scheduler.register(api)
+
+    results = {"latencies": [], "commands": 0, "failures": 0}
+    started = time.monotonic()
+    try:
+        await asyncio.gather(
+            *(
+                async_run_projector(
+                    api, scheduler, args.interval, started + args.duration, results
+                )
+                for api in apis
+            )
+        )
+    finally:
+        elapsed = time.monotonic() - started
+        await asyncio.gather(*(api.async_close() for api in apis))
+        await asyncio.gather(*(simulator.async_stop() for simulator in simulators))
+
+    latencies = sorted(results["latencies"])
+    report = {
+        "projectors": len(apis),
+        "duration": round(elapsed, 3),
+        "polls": len(latencies),
+        "failed_polls": results["failures"],
+        "polls_per_second": round(len(latencies) / elapsed, 2),
+        "commands_per_second": round(results["commands"] / elapsed, 2),
+        "poll_latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 2)
+            for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+        }
+        | {"mean": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0},
+        "max_schedule_lag": round(scheduler.stats["max_lag"], 3),
+    }
+    if simulators:
+        report["sockets_opened"] = sum(s.connections_accepted for s in simulators)
+        report["sockets_open_at_end"] = sum(s.connections_open for s in simulators)
+    return report
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10, help="number of simulated projectors")
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        help="host[:port] of a real projector, disables the simulators",
+    )
+    parser.add_argument("--interval", type=float, default=const.DEFAULT_SCAN_INTERVAL)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument(
+        "--max-concurrent", type=int, default=const.DEFAULT_MAX_CONCURRENT_POLLS
+    )
+    parser.add_argument(
+        "--no-pipelining",
+        dest="pipelining",
+        action="store_false",
+        help="send the queries of a poll one at a time",
+    )
+    add_simulator_arguments(parser)
+    report = asyncio.run(async_load_test(parser.parse_args()))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
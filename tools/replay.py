@@ -0,0 +1,192 @@
+"""Replay recorded NEC projector protocol traces.
+
+Reads a binary trace, or the diagnostics JSON of a config entry with a trace
+enabled, and either:
+
+- prints every exchange (``--dump``),
+- runs each reply through the integration parsers and the coordinator state
+  update, reporting failures and throughput (the default), or
+- serves the recorded replies on a port (``--serve``), so the integration or
+  ``tools.loadtest --target`` can be pointed at a replay of the field.
+
+Example: ``python -m tools.replay diagnostics.json --repeat 1000``
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import statistics
+import time
+from collections import defaultdict
+from itertools import cycle
+from pathlib import Path
+
+from ._integration import load
+from .loadtest import percentile
+from .simulator import ProjectorSimulator, add_simulator_arguments, simulator_options
+
+api_module = load("api")
+const = load("const")
+state_module = load("state")
+trace_module = load("trace")
+
+QUERIES = [
+    api_module.STATUS_QUERY,
+    api_module.SHUTTER_QUERY,
+    api_module.INPUT_OPTIONS_QUERY,
+    api_module.INPUT_STATUS_QUERY,
+    api_module.MUTE_STATUS_QUERY,
+    api_module.LAMP_USAGE_QUERY,
+    api_module.FILTER_USAGE_QUERY,
+    *(api_module.lens_query(axis, with_range=True) for axis in const.LENS_AXES),
+]
+PARSERS = dict(QUERIES)
+STATE_FIELDS = frozenset(state_module.NecProjectorState.__slots__)
+
+
+def load_trace(path: Path) -> list:
+    """Read trace records from a trace file or a diagnostics download."""
+    data = path.read_bytes()
+    if data[:1] == b"{":
+        diagnostics = json.loads(data)
+        encoded = diagnostics.get("data", diagnostics).get("trace")
+        if not encoded:
+            raise SystemExit(f"{path} has no protocol trace, enable it in the options")
+        data = base64.b64decode(encoded)
+    return trace_module.decode_trace(data)
+
+
+def format_frame(frame: bytes) -> str:
+    """Return a printable form of a frame."""
+    if frame[:1].isalpha():
+        return repr(frame.decode("ascii", "replace"))
+    return frame.hex(" ")
+
+
+def dump(records: list) -> None:
+    """Print every recorded exchange."""
+    for record in records:
+        response = format_frame(record.response) if record.response else "<timeout>"
+        clock = time.strftime("%H:%M:%S", time.localtime(record.timestamp))
+        milliseconds = int(record.timestamp % 1 * 1000)
+        print(
+            f"{clock}.{milliseconds:03d} {record.latency * 1000:8.1f} ms "
+            f"{format_frame(record.command)} -> {response}"
+        )
+
+
+def replay_updates(records: list, state):
+    """Parse every reply and apply it to a state snapshot like the coordinator.
+
+    Returns the final state and the counts of parsed, failed and unknown
+    replies.
+    """
+    parsed = failed = unknown = 0
+    for record in records:
+        parser = PARSERS.get(record.command)
+        if parser is None or not record.response:
+            unknown += 1
+            continue
+        try:
+            values = parser(record.response)
+        except api_module.ProjectorCommandError:
+            failed += 1
+            continue
+        parsed += 1
+        state = state.merge({key: value for key, value in values.items() if key in STATE_FIELDS})
+    return state, parsed, failed, unknown
+
+
+def report(records: list, repeat: int) -> dict:
+    """Replay the records and return a summary with throughput figures."""
+    state, parsed, failed, unknown = replay_updates(records, state_module.EMPTY_STATE)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        replay_updates(records, state_module.EMPTY_STATE)
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(record.latency for record in records if record.response)
+    kinds = defaultdict(int)
+    for record in records:
+        kinds[api_module.codec.command_type(record.command)] += 1
+    return {
+        "records": len(records),
+        "duration": round(records[-1].timestamp - records[0].timestamp, 3) if records else 0,
+        "commands": dict(kinds),
+        "timeouts": sum(1 for record in records if not record.response),
+        "parsed": parsed,
+        "parse_failures": failed,
+        "not_replayed": unknown,
+        "latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 2)
+            for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+        }
+        | {"mean": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0},
+        "final_state": {
+            key: value for key, value in state.as_dict().items() if value is not None
+        },
+        "replies_per_second": round(len(records) * repeat / elapsed) if elapsed else None,
+        "ns_per_reply": round(elapsed / (len(records) * repeat) * 1e9) if records else None,
+    }
+
+
+class ReplaySimulator(ProjectorSimulator):
+    """Simulated projector answering with the recorded replies.
+
+    Each command gets the replies recorded for it in order, starting over
+    when they run out. Commands never recorded get the simulator's answer.
+    A recorded timeout is replayed as no answer.
+    """
+
+    def __init__(self, records: list, options=None) -> None:
+        """Initialize the simulator from trace records."""
+        super().__init__(options)
+        replies = defaultdict(list)
+        for record in records:
+            replies[record.command].append(record.response)
+        self._replies = {command: cycle(values) for command, values in replies.items()}
+
+    def _handle_command(self, command: bytes, now: float) -> bytes:
+        """Answer a command with its next recorded reply."""
+        if (replies := self._replies.get(command)) is not None:
+            return next(replies)
+        return super()._handle_command(command, now)
+
+
+async def async_serve(records: list, args: argparse.Namespace) -> None:
+    """Serve the recorded replies until interrupted."""
+    simulator = ReplaySimulator(records, simulator_options(args))
+    port = await simulator.async_start(args.host, args.serve)
+    print(f"Replaying {len(records)} exchanges on {args.host}:{port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.async_stop()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", type=Path, help="trace file or diagnostics JSON")
+    parser.add_argument("--dump", action="store_true", help="print every exchange")
+    parser.add_argument("--repeat", type=int, default=100, help="replay passes to time")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve the replies on a port")
+    parser.add_argument("--host", default="127.0.0.1")
+    add_simulator_arguments(parser)
+    args = parser.parse_args()
+
+    records = load_trace(args.trace)
+    if args.dump:
+        dump(records)
+    elif args.serve is not None:
+        try:
+            asyncio.run(async_serve(records, args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(json.dumps(report(records, args.repeat), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
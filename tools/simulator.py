@@ -0,0 +1,328 @@
+"""Asyncio simulator of NEC projectors for development and load tests.
+
+Each simulated projector listens on its own localhost port and answers the
+binary status, lamp, filter and power commands as well as the ASCII shutter,
+lens and input commands used by the integration. Latency, split replies, dropped connections
+and unsupported commands can be configured to reproduce network trouble.
+
+Run ``python -m tools.simulator --count 100`` to start a fleet of simulators.
+"""
+
+import argparse
+import asyncio
+import random
+import struct
+from dataclasses import dataclass, field
+
+BINARY_HEADER_LENGTH = 5
+
+# Binary status values reported in DATA06 of the status reply
+STATE_STANDBY = 0x00
+STATE_POWER_ON = 0x04
+STATE_COOLING = 0x05
+
+# Binary error reply for an unsupported command: "command cannot be recognized"
+ERROR_UNSUPPORTED = (0x00, 0x00)
+
+
+@dataclass
+class SimulatorOptions:
+    """Behaviour of a simulated projector."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    processing_time: float = 0.0
+    split_size: int = 0
+    split_delay: float = 0.001
+    drop_rate: float = 0.0
+    unsupported: frozenset[str] = frozenset()
+    cooling_time: float = 5.0
+    model_code: int = 0x10
+
+
+@dataclass
+class ProjectorState:
+    """State of a simulated projector."""
+
+    power_on: bool = True
+    cooling_until: float = 0.0
+    lamp_usage: int = 1_234 * 3600
+    filter_usage: int = 567 * 3600
+    shutter: str = "open"
+    input_value: str = "hdmi1"
+    input_options: tuple[str, ...] = ("hdmi1", "hdmi2", "displayport", "hdbaset")
+    lens: dict[str, list[int]] = field(
+        default_factory=lambda: {
+            "zoom": [500, 0, 1000],
+            "focus": [500, 0, 1000],
+            "h_shift": [500, 0, 1000],
+            "v_shift": [500, 0, 1000],
+        }
+    )
+
+
+def checksum(data: bytes) -> int:
+    """Return the NEC binary protocol checksum of a frame."""
+    return sum(data) & 0xFF
+
+
+def binary_reply(reply_type: int, command: int, model_code: int, data: bytes) -> bytes:
+    """Build a binary reply frame."""
+    frame = bytes((reply_type, command, 0x01, model_code, len(data))) + data
+    return frame + bytes((checksum(frame),))
+
+
+class ProjectorSimulator:
+    """One simulated NEC projector."""
+
+    def __init__(self, options: SimulatorOptions | None = None) -> None:
+        """Initialize the simulator."""
+        self.options = options or SimulatorOptions()
+        self.state = ProjectorState()
+        self.port: int | None = None
+        self.connections_accepted = 0
+        self.connections_open = 0
+        self.commands_handled = 0
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the bound port."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def async_stop(self) -> None:
+        """Stop listening and close every client connection."""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        if self._handlers:
+            # Let client handlers notice the closed connections and finish.
+            await asyncio.wait(self._handlers, timeout=1)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def _status_value(self, now: float) -> int:
+        """Return the current DATA06 status value."""
+        if self.state.power_on:
+            return STATE_POWER_ON
+        if now < self.state.cooling_until:
+            return STATE_COOLING
+        return STATE_STANDBY
+
+    def _handle_binary(self, command: bytes, now: float) -> bytes:
+        """Answer one binary command."""
+        model = self.options.model_code
+        key = command[:2].hex()
+        if key in self.options.unsupported:
+            return binary_reply(0xA0 | command[0], command[1], model, bytes(ERROR_UNSUPPORTED))
+        if command[:2] == b"\x00\x85" and command[5] == 0x01:
+            data = bytearray(16)
+            data[2] = 0x01 if self.state.power_on else 0x00
+            data[3] = 0x01 if now < self.state.cooling_until else 0x00
+            data[5] = self._status_value(now)
+            return binary_reply(0x20, 0x85, model, bytes(data))
+        if command[:2] == b"\x00\x85" and command[5] == 0x02:
+            data = bytearray(16)
+            data[1] = 0x01
+            data[2] = 0x21 + self.state.input_options.index(self.state.input_value)
+            data[3] = 0x07
+            return binary_reply(0x20, 0x85, model, bytes(data))
+        if command[:2] == b"\x00\x85" and command[5] == 0x03:
+            return binary_reply(0x20, 0x85, model, bytes(16))
+        if command[:2] == b"\x03\x95":
+            data = struct.pack("<ii", self.state.filter_usage, 20_000 * 3600)
+            return binary_reply(0x23, 0x95, model, data)
+        if command[:2] == b"\x03\x96" and command[6] == 0x01:
+            data = struct.pack("<2Bi", command[5], 0x01, self.state.lamp_usage)
+            return binary_reply(0x23, 0x96, model, data)
+        if command[:2] == b"\x02\x00":
+            self.state.power_on = True
+            return binary_reply(0x22, 0x00, model, b"")
+        if command[:2] == b"\x02\x01":
+            if self.state.power_on:
+                self.state.cooling_until = now + self.options.cooling_time
+            self.state.power_on = False
+            return binary_reply(0x22, 0x01, model, b"")
+        return binary_reply(0xA0 | command[0], command[1], model, bytes(ERROR_UNSUPPORTED))
+
+    def _handle_ascii(self, command: str) -> str:
+        """Answer one ASCII command."""
+        words = command.split()
+        if not words or words[0] in self.options.unsupported:
+            return "err\r"
+        if words[0] == "shutter" and len(words) == 2:
+            if words[1] == "?":
+                return f"shutter cur={self.state.shutter}\r"
+            if words[1] in ("open", "close"):
+                self.state.shutter = words[1]
+                return "shutter ok\r"
+        if words[0] == "lens" and len(words) == 3 and words[1] in self.state.lens:
+            axis = self.state.lens[words[1]]
+            if words[2] == "?":
+                return f"lens {words[1]} cur={axis[0]} max={axis[2]} min={axis[1]}\r"
+            try:
+                target = int(words[2])
+            except ValueError:
+                return "err\r"
+            axis[0] = min(max(target, axis[1]), axis[2])
+            return f"lens {words[1]} ok\r"
+        if words[0] == "input" and len(words) == 2:
+            if words[1] == "?":
+                options = "|".join(self.state.input_options)
+                return f"input cur={self.state.input_value} sel={options}\r"
+            if words[1] in self.state.input_options:
+                self.state.input_value = words[1]
+                return "input ok\r"
+        return "err\r"
+
+    def _handle_command(self, command: bytes, now: float) -> bytes:
+        """Answer one binary or ASCII command."""
+        if command[:1].isalpha():
+            return self._handle_ascii(command.decode("ascii", "replace")).encode()
+        return self._handle_binary(command, now)
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> bytes:
+        """Read one binary or ASCII command."""
+        first = await reader.readexactly(1)
+        if first.isalpha():
+            return first + await reader.readuntil(b"\r")
+        header = first + await reader.readexactly(BINARY_HEADER_LENGTH - 1)
+        return header + await reader.readexactly(header[4] + 1)
+
+    async def _write_reply(self, writer: asyncio.StreamWriter, reply: bytes) -> None:
+        """Write a reply, split into several segments if configured."""
+        size = self.options.split_size
+        if size <= 0:
+            writer.write(reply)
+            await writer.drain()
+            return
+        for start in range(0, len(reply), size):
+            if start:
+                await asyncio.sleep(self.options.split_delay)
+            writer.write(reply[start : start + size])
+            await writer.drain()
+
+    async def _send_replies(
+        self, writer: asyncio.StreamWriter, replies: asyncio.Queue
+    ) -> None:
+        """Write queued replies in order once their delivery time has come."""
+        loop = asyncio.get_running_loop()
+        while True:
+            due, reply = await replies.get()
+            if (wait := due - loop.time()) > 0:
+                await asyncio.sleep(wait)
+            await self._write_reply(writer, reply)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection.
+
+        Commands are processed one at a time, taking ``processing_time`` each.
+        Replies are delivered ``latency`` later without holding up the next
+        command, like a network round trip, so pipelined commands overlap.
+        """
+        loop = asyncio.get_running_loop()
+        self.connections_accepted += 1
+        self.connections_open += 1
+        self._writers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        replies: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(self._send_replies(writer, replies))
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if random.random() < self.options.drop_rate:
+                    return
+                if self.options.processing_time:
+                    await asyncio.sleep(self.options.processing_time)
+                reply = self._handle_command(command, loop.time())
+                self.commands_handled += 1
+                delay = self.options.latency + random.uniform(0, self.options.jitter)
+                replies.put_nowait((loop.time() + delay, reply))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            return
+        finally:
+            sender.cancel()
+            self.connections_open -= 1
+            self._writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+
+async def async_start_fleet(
+    count: int,
+    options: SimulatorOptions | None = None,
+    host: str = "127.0.0.1",
+    base_port: int = 0,
+) -> list[ProjectorSimulator]:
+    """Start a number of simulators on consecutive or ephemeral ports."""
+    simulators = []
+    for index in range(count):
+        simulator = ProjectorSimulator(options)
+        await simulator.async_start(host, base_port + index if base_port else 0)
+        simulators.append(simulator)
+    return simulators
+
+
+def add_simulator_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options describing simulator behaviour to a parser."""
+    parser.add_argument("--latency", type=float, default=0.0, help="reply delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay in seconds")
+    parser.add_argument(
+        "--processing-time", type=float, default=0.0, help="time to process each command in seconds"
+    )
+    parser.add_argument("--split-size", type=int, default=0, help="split replies into segments of this size")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of dropping a connection per command")
+    parser.add_argument(
+        "--unsupported",
+        action="append",
+        default=[],
+        help="ASCII command word or binary command hex (e.g. 0085) to reject",
+    )
+
+
+def simulator_options(args: argparse.Namespace) -> SimulatorOptions:
+    """Build simulator options from parsed arguments."""
+    return SimulatorOptions(
+        latency=args.latency,
+        jitter=args.jitter,
+        processing_time=args.processing_time,
+        split_size=args.split_size,
+        drop_rate=args.drop_rate,
+        unsupported=frozenset(args.unsupported),
+    )
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run a simulator fleet until interrupted."""
+    simulators = await async_start_fleet(
+        args.count, simulator_options(args), args.host, args.base_port
+    )
+    for simulator in simulators:
+        print(f"{args.host}:{simulator.port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await asyncio.gather(*(simulator.async_stop() for simulator in simulators))
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1, help="number of projectors")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=17142, help="0 for ephemeral ports")
+    add_simulator_arguments(parser)
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()